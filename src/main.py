@@ -1,5 +1,5 @@
 # Input: config path, env vars, OS signals, account positions, Telegram Bot commands, and recent pressure logs
-# Output: application lifecycle, async tasks, runtime symbol orchestration, account-event position refresh, pause/resume control, reduce-only block verification wiring, orderbook_price revalidation, liq-distance risk log/mode coordination, and side-adjusted pressure recap/report summaries
+# Output: application lifecycle (uvloop event loop), async tasks, runtime symbol orchestration, account-event position refresh, pause/resume control, reduce-only block verification wiring, orderbook_price revalidation, liq-distance risk log/mode coordination, and side-adjusted pressure recap/report summaries
 # Pos: application entrypoint and orchestrator for runtime tasks, alerts, orderbook_price current-book guards, and side-adjusted pressure summaries
 # 一旦我被更新，务必更新我的开头注释，以及所属文件夹的MD。
 
@@ -29,6 +29,8 @@ from decimal import Decimal, ROUND_HALF_UP
 from pathlib import Path
 from typing import Dict, Optional, List, Sequence, Awaitable, Any, Coroutine
 
+import uvloop
+
 # 加载 .env 文件（必须在其他导入之前）
 from dotenv import load_dotenv
 load_dotenv()
@@ -3559,4 +3561,5 @@ if __name__ == "__main__":
     if len(sys.argv) > 1:
         config_file = Path(sys.argv[1])
 
-    asyncio.run(main(config_file))
+    # uvloop 事件循环：WS 收包/解析/回调为大量小任务，libuv 循环调度开销更低
+    uvloop.run(main(config_file))
@@ -99,7 +99,7 @@ class SignalReason(str, Enum):
 # 市场数据
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class MarketEvent:
     """
     市场数据事件（从 WS 接收）
@@ -171,7 +171,7 @@ class Position:
 # 仓位更新（User Data Stream）
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class PositionUpdate:
     """
     仓位更新事件（从 User Data Stream 的 ACCOUNT_UPDATE 接收）
@@ -202,7 +202,7 @@ class AccountUpdateEvent:
     has_position_delta: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class LeverageUpdate:
     """
     杠杆更新事件（从 User Data Stream 的 ACCOUNT_CONFIG_UPDATE 接收）
@@ -301,7 +301,7 @@ class OrderResult:
     error_message: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class OrderUpdate:
     """
     订单更新事件（从 User Data Stream 接收）
@@ -328,7 +328,7 @@ class OrderUpdate:
 # Algo 条件单（User Data Stream: ALGO_UPDATE）
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class AlgoOrderUpdate:
     """
     Algo 条件单更新事件（从 User Data Stream 接收）
@@ -20,6 +20,7 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import time
+from itertools import chain
 from dataclasses import dataclass
 from decimal import Decimal
 from typing import Any, Dict, Optional, Sequence
@@ -39,8 +40,16 @@ from src.models import (
 from src.utils.helpers import round_to_tick, round_up_to_tick, symbol_to_ws_stream
 from src.utils.logger import log_event, log_error
 
+# is_stop_price_valid 每次同步都会调用：常量只构造一次，避免逐次解析 Decimal 字符串
+_DEC_ZERO = Decimal("0")
+_DEC_ONE = Decimal("1")
+_STOP_MIN_DIST_RATIO = Decimal("0.0001")  # 0.01%
 
-@dataclass
+# Algo Order 终态（ALGO_UPDATE 命中后清理本地状态）
+_ALGO_TERMINAL_STATUSES = frozenset({"CANCELED", "FILLED", "TRIGGERED", "EXPIRED", "REJECTED", "FINISHED"})
+
+
+@dataclass(slots=True)
 class ProtectiveStopState:
     symbol: str
     position_side: PositionSide
@@ -54,7 +63,25 @@ class ProtectiveStopState:
 class ProtectiveStopManager:
     """保护性止损管理器（按 symbol + positionSide 维护 1 张条件单）。"""
 
-    _order_counter: int = 0  # 类级别计数器，确保运行时唯一
+    __slots__ = (
+        "_exchange",
+        "_client_order_id_prefix",
+        "_risk_stage",
+        "_risk_levels",
+        "_allow_loosen_on_liq_improve",
+        "_liq_improve_threshold",
+        "_loosen_cooldown_ms",
+        "_states",
+        "_locks",
+        "_startup_existing_logged",
+        "_startup_existing_external_logged",
+        "_external_multi_sig",
+        "_no_liq_price_logged",
+        "_liq_wrong_side_logged",
+        "_prefix_cache",
+    )
+
+    _order_counter: int = 0  # 类级别计数器，确保运行时唯一（不在 __slots__ 内，经类名读写）
 
     def __init__(
         self,
@@ -80,6 +107,8 @@ class ProtectiveStopManager:
         self._external_multi_sig: Dict[tuple[str, PositionSide], tuple[str, ...]] = {}
         self._no_liq_price_logged: set[tuple[str, PositionSide]] = set()
         self._liq_wrong_side_logged: set[tuple[str, PositionSide]] = set()
+        # 每个 symbol+side 的 clientOrderId 前缀（含 md5 兜底，只算一次）
+        self._prefix_cache: Dict[tuple[str, PositionSide], str] = {}
 
     def _is_liq_improved(
         self,
@@ -115,6 +144,10 @@ class ProtectiveStopManager:
 
     def _build_client_order_id_prefix(self, symbol: str, position_side: PositionSide) -> str:
         """生成 clientOrderId 前缀（用于识别属于本程序的保护止损单）。"""
+        key = (symbol, position_side)
+        prefix = self._prefix_cache.get(key)
+        if prefix is not None:
+            return prefix
         ws_symbol = symbol_to_ws_stream(symbol)
         side_code = "L" if position_side == PositionSide.LONG else "S"
         prefix = f"{self._client_order_id_prefix}{ws_symbol}-{side_code}"
@@ -122,6 +155,7 @@ class ProtectiveStopManager:
             # 超长 symbol：使用 md5 稳定哈希（hash() 跨进程不稳定）
             stable_hash = hashlib.md5(ws_symbol.encode()).hexdigest()[:7]
             prefix = f"{self._client_order_id_prefix}{stable_hash}-{side_code}"
+        self._prefix_cache[key] = prefix
         return prefix
 
     def build_client_order_id(self, symbol: str, position_side: PositionSide) -> str:
@@ -191,7 +225,7 @@ class ProtectiveStopManager:
         position_side: PositionSide,
         stop_price: Decimal,
         liquidation_price: Decimal,
-        min_dist_ratio: Decimal = Decimal("0.0001"),  # 0.01%
+        min_dist_ratio: Decimal = _STOP_MIN_DIST_RATIO,
     ) -> bool:
         """
         检查止损价是否有效（能在爆仓前触发）。
@@ -209,17 +243,17 @@ class ProtectiveStopManager:
         Returns:
             True 如果止损价有效
         """
-        if liquidation_price <= Decimal("0") or stop_price <= Decimal("0"):
+        if liquidation_price <= _DEC_ZERO or stop_price <= _DEC_ZERO:
             return False
 
         if position_side == PositionSide.LONG:
             # LONG 止损是 SELL stop，价格下跌触发
             # 止损价必须高于爆仓价（这样价格下跌时先触发止损）
-            return stop_price > liquidation_price * (Decimal("1") + min_dist_ratio)
+            return stop_price > liquidation_price * (_DEC_ONE + min_dist_ratio)
         else:
             # SHORT 止损是 BUY stop，价格上涨触发
             # 止损价必须低于爆仓价（这样价格上涨时先触发止损）
-            return stop_price < liquidation_price * (Decimal("1") - min_dist_ratio)
+            return stop_price < liquidation_price * (_DEC_ONE - min_dist_ratio)
 
     def _extract_order_id(self, order: Dict[str, Any]) -> Optional[str]:
         """提取订单 ID（支持 algo order 的 algoId 和普通订单的 id）"""
@@ -381,9 +415,10 @@ class ProtectiveStopManager:
         当我们的保护止损单状态变化时，清理本地状态。
         注：只处理我们自己的订单（由 main.py 在调用前用前缀过滤）。
         """
-        # Algo Order 终态
-        terminal_statuses = {"CANCELED", "FILLED", "TRIGGERED", "EXPIRED", "REJECTED", "FINISHED"}
-        if update.status.upper() not in terminal_statuses:
+        if update.status.upper() not in _ALGO_TERMINAL_STATUSES:
+            return
+        # 不带本程序总前缀的订单不可能匹配任何 symbol+side 前缀，直接跳过
+        if not update.client_algo_id.startswith(self._client_order_id_prefix):
             return
 
         for side in (PositionSide.LONG, PositionSide.SHORT):
@@ -432,20 +467,14 @@ class ProtectiveStopManager:
 
                 # 查询 algo 挂单（条件订单在 2025-12-09 后迁移到 Algo Service）
                 algo_orders = await self._exchange.fetch_open_algo_orders(symbol)
-
-                # 合并所有订单
-                all_orders: list[Dict[str, Any]] = []
-                for o in list(open_orders):
-                    if isinstance(o, dict):
-                        all_orders.append(o)
-                for o in list(algo_orders):
-                    if isinstance(o, dict):
-                        all_orders.append(o)
+                # 在 try 内取迭代器：响应 data 为 null（None）等非可迭代结果按获取失败处理
+                orders = chain(iter(open_orders), iter(algo_orders))
             except Exception as e:
                 log_error(f"保护止损同步失败（获取挂单）: {e}", symbol=symbol)
                 return {PositionSide.LONG: False, PositionSide.SHORT: False}
 
             # 分类订单：我们自己的（前缀匹配）vs 外部的 closePosition 止损单
+            # openOrders 与 algo 挂单串联后单遍分桶（不再先合并成中间列表）
             orders_by_side: Dict[PositionSide, list[Dict[str, Any]]] = {PositionSide.LONG: [], PositionSide.SHORT: []}
             external_stops_by_side: Dict[PositionSide, bool] = {PositionSide.LONG: False, PositionSide.SHORT: False}
             external_stop_orders_by_side: Dict[PositionSide, list[Dict[str, Any]]] = {
@@ -455,7 +484,7 @@ class ProtectiveStopManager:
             external_latch_by_side = external_stop_latch_by_side or {}
             external_stop_sample_by_side: Dict[PositionSide, Dict[str, Any]] = {}
 
-            for order in all_orders:
+            for order in orders:
                 if not isinstance(order, dict):
                     continue
                 ps = self._extract_position_side(order)
@@ -776,15 +805,12 @@ class ProtectiveStopManager:
         # 只允许“收紧”止损：禁止把 stopPrice 往“更远/更松”方向移动
         # LONG：stopPrice 越高越早触发（更紧），不允许下调
         # SHORT：stopPrice 越低越早触发（更紧），不允许上调
-        if (
-            keep_order is not None
-            and existing_norm is not None
+        is_loosen = (
+            existing_norm is not None
             and desired_norm is not None
-            and (
-                (side == PositionSide.LONG and desired_norm < existing_norm)
-                or (side == PositionSide.SHORT and desired_norm > existing_norm)
-            )
-        ):
+            and (desired_norm < existing_norm if side == PositionSide.LONG else desired_norm > existing_norm)
+        )
+        if is_loosen:
             allow_loosen = False
             now_ms = int(time.time() * 1000)
             if (
@@ -842,7 +868,7 @@ class ProtectiveStopManager:
                     )
                 return
 
-        if keep_order is not None and existing_norm is not None and desired_norm is not None and existing_norm == desired_norm:
+        if existing_norm is not None and desired_norm == existing_norm:
             self._states[(symbol, side)] = ProtectiveStopState(
                 symbol=symbol,
                 position_side=side,
@@ -905,17 +931,7 @@ class ProtectiveStopManager:
             stop_price=desired_stop_price,
             liquidation_price=liquidation_price,
             last_loosen_ms=(
-                int(time.time() * 1000)
-                if (
-                    keep_order is not None
-                    and existing_norm is not None
-                    and desired_norm is not None
-                    and (
-                        (side == PositionSide.LONG and desired_norm < existing_norm)
-                        or (side == PositionSide.SHORT and desired_norm > existing_norm)
-                    )
-                )
-                else (previous_state.last_loosen_ms if previous_state else 0)
+                int(time.time() * 1000) if is_loosen else (previous_state.last_loosen_ms if previous_state else 0)
             ),
         )
 
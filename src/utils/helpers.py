@@ -1,5 +1,5 @@
 # Input: numeric values, time, symbols
-# Output: rounded values and formatting helpers
+# Output: rounded values, cached WS number parsing, and formatting helpers
 # Pos: utility functions and formatters
 # 一旦我被更新，务必更新我的开头注释，以及所属文件夹的MD。
 
@@ -13,6 +13,7 @@
 """
 
 from decimal import Decimal, ROUND_DOWN, ROUND_HALF_UP, ROUND_UP
+from functools import lru_cache
 from typing import Optional
 import time
 
@@ -93,10 +94,12 @@ def current_time_ms() -> int:
     """
     获取当前时间戳（毫秒）
 
+    使用 time_ns 整数截断，避免 float 乘法与精度误差（is_stale 等高频路径调用）。
+
     Returns:
         当前时间戳
     """
-    return int(time.time() * 1000)
+    return time.time_ns() // 1_000_000
 
 
 def symbol_to_ws_stream(symbol: str) -> str:
@@ -116,12 +119,15 @@ def symbol_to_ws_stream(symbol: str) -> str:
     return base.replace("/", "").lower()  # btcusdt
 
 
+@lru_cache(maxsize=512)
 def ws_stream_to_symbol(stream_symbol: str) -> str:
     """
     将 Binance WS stream symbol 转换为 ccxt 格式
 
     例如：BTCUSDT -> BTC/USDT:USDT
 
+    symbol 集合有限且账户流每个事件都要换算，结果按输入缓存（每个 symbol 只换算一次）
+
     Args:
         stream_symbol: WS stream 格式
 
@@ -137,6 +143,22 @@ def ws_stream_to_symbol(stream_symbol: str) -> str:
     return stream_symbol
 
 
+@lru_cache(maxsize=8192)
+def parse_ws_decimal(raw: str) -> Decimal:
+    """
+    将 WS 推送的数值字符串解析为 Decimal
+
+    行情价位与账户流数量（如 "0"）高频重复，结果按输入缓存；Decimal 不可变，缓存实例可安全共享。
+
+    Args:
+        raw: 数值字符串
+
+    Returns:
+        Decimal 值
+    """
+    return Decimal(raw)
+
+
 def format_decimal(value: Optional[Decimal], precision: int = 4) -> Optional[str]:
     """
     格式化 Decimal（用于日志/通知），最多保留指定小数位并去除尾部 0。
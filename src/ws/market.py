@@ -1,5 +1,5 @@
 # Input: WS URLs, symbols, callbacks, reconnect state
-# Output: MarketEvent stream + reconnect callbacks (aiohttp ws + proxy + explicit close timeout)
+# Output: MarketEvent stream + reconnect callbacks (aiohttp ws + orjson decoding + proxy + explicit close timeout)
 # Pos: market WS client (market data)
 # 一旦我被更新，务必更新我的开头注释，以及所属文件夹的MD。
 
@@ -23,11 +23,11 @@
 """
 
 import asyncio
-import json
 from decimal import Decimal
 from typing import Callable, Dict, List, Optional, Any
 
 import aiohttp
+import orjson
 
 from src.models import MarketEvent
 from src.utils.logger import (
@@ -37,7 +37,7 @@ from src.utils.logger import (
     log_ws_reconnect,
     log_error,
 )
-from src.utils.helpers import current_time_ms, ws_stream_to_symbol
+from src.utils.helpers import current_time_ms, parse_ws_decimal, ws_stream_to_symbol
 
 
 # Binance Futures WebSocket 基础 URL
@@ -49,10 +49,42 @@ WS_CLOSE_TIMEOUT_S = 1.0
 SESSION_CLOSE_TIMEOUT_S = 1.0
 WS_HEARTBEAT_S = 20.0
 
+# 每个 symbol 订阅的 stream 后缀（depth symbol 额外订阅 depth10）
+_BOOK_TICKER_SUFFIX = "bookTicker"
+_DEPTH_SUFFIX = "depth10@100ms"
+_AGG_TRADE_SUFFIX = "aggTrade"
+_MARK_PRICE_SUFFIX = "markPrice@1s"
+_STREAM_SUFFIXES = (_BOOK_TICKER_SUFFIX, _AGG_TRADE_SUFFIX, _MARK_PRICE_SUFFIX)
+_DEPTH_STREAM_SUFFIXES = (_BOOK_TICKER_SUFFIX, _DEPTH_SUFFIX, _AGG_TRADE_SUFFIX, _MARK_PRICE_SUFFIX)
+
 
 class MarketWSClient:
     """市场数据 WebSocket 客户端"""
 
+    __slots__ = (
+        "symbols",
+        "depth_symbols",
+        "on_event",
+        "on_reconnect",
+        "initial_delay_ms",
+        "max_delay_ms",
+        "multiplier",
+        "stale_data_ms",
+        "proxy",
+        "_ccxt_to_ws",
+        "_ws_symbol_map",
+        "_payload_parsers",
+        "_stream_url",
+        "_ws",
+        "_session",
+        "_running",
+        "_reconnect_task",
+        "_current_delay_ms",
+        "_reconnect_count",
+        "_last_update_ms",
+        "_last_mark_price_ms",
+    )
+
     def __init__(
         self,
         symbols: List[str],
@@ -89,6 +121,24 @@ class MarketWSClient:
         self.stale_data_ms = stale_data_ms
         self.proxy = proxy
 
+        # symbol 集合固定：ccxt <-> WS 名称在初始化时一次性换算，之后只做 dict 查找
+        # ccxt symbol -> WS stream 名称（如 "btcusdt"）
+        self._ccxt_to_ws: Dict[str, str] = {symbol: self._symbol_to_ws(symbol) for symbol in symbols}
+        # WS 原始 symbol（如 "BTCUSDT"）-> ccxt symbol；每帧一次 dict 查找，未订阅返回 None
+        self._ws_symbol_map: Dict[str, str] = {
+            ws_name.upper(): symbol for symbol, ws_name in self._ccxt_to_ws.items()
+        }
+
+        # stream 后缀 -> 仅需 payload 的解析器（depth10 需要 stream 名兜底 symbol，单独分派）
+        self._payload_parsers: Dict[str, Callable[[Dict[str, Any]], Optional[MarketEvent]]] = {
+            _BOOK_TICKER_SUFFIX: self._parse_book_ticker,
+            _AGG_TRADE_SUFFIX: self._parse_agg_trade,
+            _MARK_PRICE_SUFFIX: self._parse_mark_price,
+        }
+
+        # 订阅集合在实例生命周期内固定：URL 只构建一次，重连复用
+        self._stream_url = self._build_stream_url()
+
         # WebSocket 连接
         self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
         self._session: Optional[aiohttp.ClientSession] = None
@@ -98,10 +148,11 @@ class MarketWSClient:
         # 当前重连延迟
         self._current_delay_ms = initial_delay_ms
 
-        # 每个 symbol 的最后更新时间
-        self._last_update_ms: Dict[str, int] = {}
+        # 每个 symbol 的最后更新时间（按订阅集合预分配，0 表示尚无数据；
+        # 解析器只为已订阅 symbol 产出事件，键集合固定，长期运行不会增长/扩容）
+        self._last_update_ms: Dict[str, int] = dict.fromkeys(symbols, 0)
         # 每个 symbol 的最后 markPrice 更新时间（不参与 stale 判定）
-        self._last_mark_price_ms: Dict[str, int] = {}
+        self._last_mark_price_ms: Dict[str, int] = dict.fromkeys(symbols, 0)
 
         # 重连次数
         self._reconnect_count = 0
@@ -112,22 +163,17 @@ class MarketWSClient:
 
         格式: wss://fstream.binance.com/stream?streams=btcusdt@bookTicker/btcusdt@aggTrade/...
         """
-        streams = []
-        for symbol in self.symbols:
-            # 转换 ccxt 格式到 WS 格式
-            ws_symbol = self._symbol_to_ws(symbol)
-            streams.append(f"{ws_symbol}@bookTicker")
-            if symbol in self.depth_symbols:
-                streams.append(f"{ws_symbol}@depth10@100ms")
-            streams.append(f"{ws_symbol}@aggTrade")
-            streams.append(f"{ws_symbol}@markPrice@1s")
-
-        stream_str = "/".join(streams)
-        return f"{WS_BASE_URL}/stream?streams={stream_str}"
+        depth_symbols = set(self.depth_symbols)
+        streams = [
+            f"{self._ccxt_to_ws[symbol]}@{suffix}"
+            for symbol in self.symbols
+            for suffix in (_DEPTH_STREAM_SUFFIXES if symbol in depth_symbols else _STREAM_SUFFIXES)
+        ]
+        return f"{WS_BASE_URL}/stream?streams={'/'.join(streams)}"
 
     def _symbol_to_ws(self, symbol: str) -> str:
         """
-        将 ccxt 格式 symbol 转换为 WS 格式
+        将 ccxt 格式 symbol 转换为 WS 格式（仅初始化建表时调用，运行期查 self._ccxt_to_ws）
 
         "BTC/USDT:USDT" -> "btcusdt"
         """
@@ -137,7 +183,7 @@ class MarketWSClient:
 
     def _ws_to_symbol(self, ws_symbol: str) -> str:
         """
-        将 WS 格式 symbol 转换为 ccxt 格式
+        将 WS 格式 symbol 转换为 ccxt 格式（通用换算；消息解析查 self._ws_symbol_map）
 
         "BTCUSDT" -> "BTC/USDT:USDT"
         """
@@ -155,11 +201,12 @@ class MarketWSClient:
         self._running = True
         logger = get_logger()
 
-        url = self._build_stream_url()
+        url = self._stream_url
         logger.debug(f"WS 连接 URL: {url}")
 
         try:
             was_reconnect = self._reconnect_count > 0
+            # 会话仅首次连接时创建、disconnect() 时关闭；重连只重开 ws（复用连接池与 DNS 缓存）
             if not self._session or self._session.closed:
                 timeout = aiohttp.ClientTimeout(total=HTTP_TIMEOUT_S)
                 self._session = aiohttp.ClientSession(timeout=timeout)
@@ -239,9 +286,10 @@ class MarketWSClient:
 
                 if message.type == aiohttp.WSMsgType.TEXT:
                     try:
-                        data = json.loads(message.data)
-                        await self._handle_message(data)
-                    except json.JSONDecodeError as e:
+                        # 与 User Data 接收循环同一解码入口（orjson）
+                        data = message.json(loads=orjson.loads)
+                        self._handle_message(data)
+                    except orjson.JSONDecodeError as e:
                         log_error(f"JSON 解析错误: {e}")
                     except Exception as e:
                         log_error(f"消息处理错误: {e}")
@@ -269,9 +317,9 @@ class MarketWSClient:
                 log_ws_disconnect("market_data")
             await self._reconnect()
 
-    async def _handle_message(self, data: Dict[str, Any]) -> None:
+    def _handle_message(self, data: Dict[str, Any]) -> None:
         """
-        处理 WS 消息
+        处理 WS 消息（同步：解析与回调都不 await，避免每帧创建协程）
 
         Combined streams 格式:
         {
@@ -285,15 +333,13 @@ class MarketWSClient:
         if not stream or not payload:
             return
 
-        # 解析事件
-        if "@bookTicker" in stream:
-            event = self._parse_book_ticker(payload)
-        elif "@depth10" in stream:
+        # 解析事件：按 "btcusdt@<后缀>" 的后缀一次 dict 查找分派
+        suffix = stream.partition("@")[2]
+        parser = self._payload_parsers.get(suffix)
+        if parser is not None:
+            event = parser(payload)
+        elif suffix == _DEPTH_SUFFIX:
             event = self._parse_depth(stream, payload)
-        elif "@aggTrade" in stream:
-            event = self._parse_agg_trade(payload)
-        elif "@markPrice" in stream:
-            event = self._parse_mark_price(payload)
         else:
             return
 
@@ -324,17 +370,15 @@ class MarketWSClient:
         }
         """
         try:
-            ws_symbol = data.get("s", "")
-            symbol = self._ws_to_symbol(ws_symbol)
-
             # 验证是我们订阅的 symbol
-            if symbol not in self.symbols:
+            symbol = self._ws_symbol_map.get(data.get("s", ""))
+            if symbol is None:
                 return None
 
-            best_bid = Decimal(str(data.get("b", "0")))
-            best_bid_qty = Decimal(str(data.get("B", "0")))
-            best_ask = Decimal(str(data.get("a", "0")))
-            best_ask_qty = Decimal(str(data.get("A", "0")))
+            best_bid = parse_ws_decimal(str(data.get("b", "0")))
+            best_bid_qty = parse_ws_decimal(str(data.get("B", "0")))
+            best_ask = parse_ws_decimal(str(data.get("a", "0")))
+            best_ask_qty = parse_ws_decimal(str(data.get("A", "0")))
             timestamp_ms = int(data.get("T", 0)) or int(data.get("E", 0)) or current_time_ms()
 
             # 验证 bid <= ask（bid > ask 为异常数据，bid == ask 在低流动性市场可能出现）
@@ -363,9 +407,9 @@ class MarketWSClient:
             ws_symbol = data.get("s", "")
             if not ws_symbol and "@depth10" in stream:
                 ws_symbol = stream.split("@", 1)[0].upper()
-            symbol = self._ws_to_symbol(ws_symbol)
+            symbol = self._ws_symbol_map.get(ws_symbol)
 
-            if symbol not in self.depth_symbols:
+            if symbol is None or symbol not in self.depth_symbols:
                 return None
 
             bids_raw = data.get("b", []) or []
@@ -393,8 +437,8 @@ class MarketWSClient:
         for level in raw_levels:
             if not isinstance(level, (list, tuple)) or len(level) < 2:
                 continue
-            price = Decimal(str(level[0]))
-            qty = Decimal(str(level[1]))
+            price = parse_ws_decimal(str(level[0]))
+            qty = parse_ws_decimal(str(level[1]))
             if price <= Decimal("0") or qty < Decimal("0"):
                 continue
             levels.append((price, qty))
@@ -419,15 +463,13 @@ class MarketWSClient:
         }
         """
         try:
-            ws_symbol = data.get("s", "")
-            symbol = self._ws_to_symbol(ws_symbol)
-
             # 验证是我们订阅的 symbol
-            if symbol not in self.symbols:
+            symbol = self._ws_symbol_map.get(data.get("s", ""))
+            if symbol is None:
                 return None
 
-            last_trade_price = Decimal(str(data.get("p", "0")))
-            trade_qty = Decimal(str(data.get("q", "0")))
+            last_trade_price = parse_ws_decimal(str(data.get("p", "0")))
+            trade_qty = parse_ws_decimal(str(data.get("q", "0")))
             is_buyer_maker = bool(data.get("m", False))
             timestamp_ms = int(data.get("T", 0)) or int(data.get("E", 0)) or current_time_ms()
 
@@ -462,13 +504,12 @@ class MarketWSClient:
         }
         """
         try:
-            ws_symbol = data.get("s", "")
-            symbol = self._ws_to_symbol(ws_symbol)
-
-            if symbol not in self.symbols:
+            # 验证是我们订阅的 symbol
+            symbol = self._ws_symbol_map.get(data.get("s", ""))
+            if symbol is None:
                 return None
 
-            mark_price = Decimal(str(data.get("p", "0")))
+            mark_price = parse_ws_decimal(str(data.get("p", "0")))
             timestamp_ms = int(data.get("E", 0)) or int(data.get("T", 0)) or current_time_ms()
 
             if mark_price <= Decimal("0"):
@@ -1,5 +1,5 @@
 # Input: API keys, listenKey, callbacks, reconnect state
-# Output: order/position/leverage/account updates (maker role/pnl/fee + aiohttp ws + proxy + explicit close timeout)
+# Output: order/position/leverage/account updates (maker role/pnl/fee + aiohttp ws + orjson decoding + proxy + explicit close timeout)
 # Pos: user data WS client (account stream)
 # 一旦我被更新，务必更新我的开头注释，以及所属文件夹的MD。
 
@@ -24,11 +24,11 @@ User Data Stream WebSocket 模块
 """
 
 import asyncio
-import json
 from decimal import Decimal
-from typing import Callable, Dict, Optional, Any, List
+from typing import Awaitable, Callable, Dict, Optional, Any, List
 
 import aiohttp
+import orjson
 
 from src.models import (
     AccountUpdateEvent,
@@ -47,7 +47,7 @@ from src.utils.logger import (
     log_ws_reconnect,
     log_error,
 )
-from src.utils.helpers import current_time_ms
+from src.utils.helpers import current_time_ms, parse_ws_decimal, ws_stream_to_symbol
 
 
 # Binance Futures REST API 基础 URL
@@ -69,6 +69,32 @@ LISTEN_KEY_CLOSE_TIMEOUT_S = 1.5
 TASK_CANCEL_TIMEOUT_S = 1.0
 WS_HEARTBEAT_S = 20.0
 
+# Binance 订单状态字符串 -> OrderStatus（模块级只构造一次）
+_ORDER_STATUS_MAP: Dict[str, OrderStatus] = {
+    "NEW": OrderStatus.NEW,
+    "PARTIALLY_FILLED": OrderStatus.PARTIALLY_FILLED,
+    "FILLED": OrderStatus.FILLED,
+    "CANCELED": OrderStatus.CANCELED,
+    "REJECTED": OrderStatus.REJECTED,
+    "EXPIRED": OrderStatus.EXPIRED,
+}
+
+# ACCOUNT_UPDATE 持仓方向字符串 -> PositionSide（仅对冲模式的 LONG/SHORT）
+_POSITION_SIDE_MAP: Dict[str, PositionSide] = {
+    "LONG": PositionSide.LONG,
+    "SHORT": PositionSide.SHORT,
+}
+
+
+_ZERO = Decimal("0")
+
+
+def _maybe_dec(raw: Any) -> Decimal:
+    """缺省/零值字段直接返回共享的 _ZERO（NEW/CANCELED 等事件大部分数值为 0），其余走 parse_ws_decimal"""
+    if raw is None or raw == "0" or raw == "0.0":
+        return _ZERO
+    return parse_ws_decimal(str(raw))
+
 
 class UserDataWSClient:
     """User Data Stream WebSocket 客户端"""
@@ -88,6 +114,7 @@ class UserDataWSClient:
         initial_delay_ms: int = 1000,
         max_delay_ms: int = 30000,
         multiplier: int = 2,
+        session: Optional[aiohttp.ClientSession] = None,
     ):
         """
         初始化 User Data Stream 客户端
@@ -106,6 +133,8 @@ class UserDataWSClient:
             initial_delay_ms: 重连初始延迟
             max_delay_ms: 重连最大延迟
             multiplier: 重连延迟倍数
+            session: 外部共享的 HTTP session（由调用方创建/关闭，超时亦由调用方配置）；
+                不传则首次连接时自建，disconnect() 时关闭
         """
         self.api_key = api_key
         self.api_secret = api_secret
@@ -135,10 +164,20 @@ class UserDataWSClient:
         self._current_delay_ms = initial_delay_ms
         self._reconnect_count = 0
 
-        # HTTP session
-        self._session: Optional[aiohttp.ClientSession] = None
+        # HTTP session（外部传入则复用其连接池，生命周期归调用方）
+        self._session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
         self._disconnect_lock = asyncio.Lock()
 
+        # 事件类型 -> 处理函数（每条消息一次 dict 查找）
+        self._event_handlers: Dict[str, Callable[[Dict[str, Any]], Awaitable[None]]] = {
+            "listenKeyExpired": self._handle_listen_key_expired,
+            "ORDER_TRADE_UPDATE": self._handle_order_trade_update,
+            "ALGO_UPDATE": self._handle_algo_update,
+            "ACCOUNT_UPDATE": self._handle_account_update,
+            "ACCOUNT_CONFIG_UPDATE": self._handle_account_config_update,
+        }
+
     def _get_rest_url(self) -> str:
         """获取 REST API URL"""
         return REST_TESTNET_URL if self.testnet else REST_BASE_URL
@@ -161,8 +200,8 @@ class UserDataWSClient:
 
         try:
             was_reconnect = self._reconnect_count > 0
-            # 创建 HTTP session（带默认超时）
-            if not self._session or self._session.closed:
+            # 创建自有 HTTP session（带默认超时）；外部 session 直接复用
+            if self._owns_session and (not self._session or self._session.closed):
                 timeout = aiohttp.ClientTimeout(total=HTTP_TIMEOUT_S)
                 self._session = aiohttp.ClientSession(timeout=timeout)
 
@@ -174,7 +213,8 @@ class UserDataWSClient:
             ws_url = f"{self._get_ws_url()}/ws/{self._listen_key}"
             logger.debug(f"User Data Stream URL: {ws_url[:50]}...")
 
-            # 建立 WS 连接
+            # 建立 WS 连接（session 已由 _get_listen_key 校验）
+            assert self._session is not None
             self._ws = await self._session.ws_connect(
                 ws_url,
                 heartbeat=WS_HEARTBEAT_S,
@@ -221,46 +261,49 @@ class UserDataWSClient:
             had_resources = (
                 self._ws is not None
                 or self._listen_key is not None
-                or self._session is not None
+                or (self._owns_session and self._session is not None)
                 or (self._keepalive_task is not None and not self._keepalive_task.done())
             )
 
             self._running = False
 
-            # 取消续期任务
-            if self._keepalive_task and not self._keepalive_task.done():
-                self._keepalive_task.cancel()
-                try:
-                    await asyncio.wait_for(self._keepalive_task, timeout=TASK_CANCEL_TIMEOUT_S)
-                except asyncio.CancelledError:
-                    pass
-                except asyncio.TimeoutError:
-                    pass
-            self._keepalive_task = None
-
-            # 关闭 WS 连接
-            if self._ws:
-                try:
-                    await asyncio.wait_for(self._ws.close(), timeout=WS_CLOSE_TIMEOUT_S)
-                except Exception:
-                    pass
-                self._ws = None
-
-            # 关闭 listenKey
-            if self._listen_key:
-                try:
-                    await asyncio.wait_for(self._close_listen_key(), timeout=LISTEN_KEY_CLOSE_TIMEOUT_S)
-                except Exception as e:
-                    get_logger().warning(f"关闭 listenKey 失败: {e}")
-                self._listen_key = None
+            try:
+                # 取消续期任务
+                if self._keepalive_task and not self._keepalive_task.done():
+                    self._keepalive_task.cancel()
+                    try:
+                        await asyncio.wait_for(self._keepalive_task, timeout=TASK_CANCEL_TIMEOUT_S)
+                    except asyncio.CancelledError:
+                        pass
+                    except asyncio.TimeoutError:
+                        pass
+                self._keepalive_task = None
+
+                # 关闭 WS 连接
+                if self._ws:
+                    try:
+                        await asyncio.wait_for(self._ws.close(), timeout=WS_CLOSE_TIMEOUT_S)
+                    except Exception:
+                        pass
+                    self._ws = None
 
-            # 关闭 HTTP session
-            if self._session:
-                try:
-                    await asyncio.wait_for(self._session.close(), timeout=SESSION_CLOSE_TIMEOUT_S)
-                except Exception:
-                    pass
-                self._session = None
+                # 关闭 listenKey（REST DELETE 限时，慢请求不拖住退出）
+                if self._listen_key:
+                    try:
+                        await asyncio.wait_for(self._close_listen_key(), timeout=LISTEN_KEY_CLOSE_TIMEOUT_S)
+                    except asyncio.TimeoutError:
+                        get_logger().warning(f"关闭 listenKey 超时（{LISTEN_KEY_CLOSE_TIMEOUT_S}s），跳过")
+                    except Exception as e:
+                        get_logger().warning(f"关闭 listenKey 失败: {e}")
+                    self._listen_key = None
+            finally:
+                # 关闭自有 HTTP session（外部 session 由调用方关闭）；前面步骤被取消也要释放
+                if self._owns_session and self._session:
+                    try:
+                        await asyncio.wait_for(self._session.close(), timeout=SESSION_CLOSE_TIMEOUT_S)
+                    except Exception:
+                        pass
+                    self._session = None
 
             if had_resources:
                 log_ws_disconnect("user_data")
@@ -346,9 +389,10 @@ class UserDataWSClient:
 
                 if message.type == aiohttp.WSMsgType.TEXT:
                     try:
-                        data = json.loads(message.data)
+                        # 走 aiohttp 的 WSMessage.json 入口，解码器换成 orjson
+                        data = message.json(loads=orjson.loads)
                         await self._handle_message(data)
-                    except json.JSONDecodeError as e:
+                    except orjson.JSONDecodeError as e:
                         log_error(f"JSON 解析错误: {e}")
                     except Exception as e:
                         log_error(f"消息处理错误: {e}")
@@ -378,51 +422,54 @@ class UserDataWSClient:
 
     async def _handle_message(self, data: Dict[str, Any]) -> None:
         """
-        处理 WS 消息
+        处理 WS 消息（按事件类型查表分派，未知事件忽略）
 
         User Data Stream 事件类型：
         - listenKeyExpired: listenKey 过期
         - ACCOUNT_UPDATE: 账户更新
         - ORDER_TRADE_UPDATE: 订单/交易更新
+        - ALGO_UPDATE: Algo 条件单更新
         - ACCOUNT_CONFIG_UPDATE: 配置更新（如杠杆）
         """
-        event_type = data.get("e", "")
-
-        if event_type == "listenKeyExpired":
-            get_logger().warning("listenKey 已过期，重新连接...")
-            if self._running:
-                await self._reconnect()
-            return
+        handler = self._event_handlers.get(data.get("e", ""))
+        if handler:
+            await handler(data)
 
-        if event_type == "ORDER_TRADE_UPDATE":
-            order_update = self._parse_order_update(data)
-            if order_update:
-                self.on_order_update(order_update)
-            return
-
-        if event_type == "ALGO_UPDATE":
-            algo_update = self._parse_algo_order_update(data)
-            if algo_update and self.on_algo_order_update:
-                self.on_algo_order_update(algo_update)
-            return
-
-        if event_type == "ACCOUNT_UPDATE":
-            account_event = self._parse_account_update_event(data)
-            if account_event and self.on_account_update_event:
-                self.on_account_update_event(account_event)
-            if self.on_position_update:
-                updates = self._parse_account_update(data)
-                for update in updates:
-                    self.on_position_update(update)
-            return
+    async def _handle_listen_key_expired(self, data: Dict[str, Any]) -> None:
+        """listenKey 过期：重新连接（重新获取 listenKey）"""
+        get_logger().warning("listenKey 已过期，重新连接...")
+        if self._running:
+            await self._reconnect()
 
-        if event_type == "ACCOUNT_CONFIG_UPDATE":
-            if not self.on_leverage_update:
-                return
-            update = self._parse_account_config_update(data)
-            if update:
-                self.on_leverage_update(update)
+    async def _handle_order_trade_update(self, data: Dict[str, Any]) -> None:
+        """ORDER_TRADE_UPDATE -> on_order_update"""
+        order_update = self._parse_order_update(data)
+        if order_update:
+            self.on_order_update(order_update)
+
+    async def _handle_algo_update(self, data: Dict[str, Any]) -> None:
+        """ALGO_UPDATE -> on_algo_order_update"""
+        algo_update = self._parse_algo_order_update(data)
+        if algo_update and self.on_algo_order_update:
+            self.on_algo_order_update(algo_update)
+
+    async def _handle_account_update(self, data: Dict[str, Any]) -> None:
+        """ACCOUNT_UPDATE -> on_account_update_event + on_position_update"""
+        account_event = self._parse_account_update_event(data)
+        if account_event and self.on_account_update_event:
+            self.on_account_update_event(account_event)
+        if self.on_position_update:
+            updates = self._parse_account_update(data)
+            for update in updates:
+                self.on_position_update(update)
+
+    async def _handle_account_config_update(self, data: Dict[str, Any]) -> None:
+        """ACCOUNT_CONFIG_UPDATE -> on_leverage_update"""
+        if not self.on_leverage_update:
             return
+        update = self._parse_account_config_update(data)
+        if update:
+            self.on_leverage_update(update)
 
     def _parse_order_update(self, data: Dict[str, Any]) -> Optional[OrderUpdate]:
         """
@@ -468,71 +515,76 @@ class UserDataWSClient:
             }
         }
         """
+        # 缺 o 或缺 symbol/orderId 的事件无法关联订单，直接丢弃（不进入异常路径）
+        order_data = data.get("o")
+        if not order_data or "s" not in order_data or "i" not in order_data:
+            return None
+
         try:
-            order_data = data.get("o", {})
-            if not order_data:
-                return None
+            # 字段读取统一走绑定好的 dict.get（每个字段省一次属性查找）
+            get = order_data.get
 
             # 解析 symbol（需要转换为 ccxt 格式）
-            ws_symbol = order_data.get("s", "")
+            ws_symbol = get("s", "")
             symbol = self._ws_to_symbol(ws_symbol)
 
             # 解析方向
-            side_str = order_data.get("S", "")
+            side_str = get("S", "")
             side = OrderSide.BUY if side_str == "BUY" else OrderSide.SELL
 
             # 解析持仓方向
-            ps_str = order_data.get("ps", "")
+            ps_str = get("ps", "")
             position_side = PositionSide.LONG if ps_str == "LONG" else PositionSide.SHORT
 
             # 解析状态
-            status_str = order_data.get("X", "")
+            status_str = get("X", "")
             status = self._parse_order_status(status_str)
 
             # 解析数量和价格
-            filled_qty = Decimal(str(order_data.get("z", "0")))
-            avg_price = Decimal(str(order_data.get("ap", "0")))
-
-            order_type = order_data.get("o")
-            close_position = order_data.get("cp")
-            reduce_only = order_data.get("R")
-            is_maker = order_data.get("m")
-            realized_pnl_raw = order_data.get("rp")
-            commission_raw = order_data.get("n")
-            commission_asset = order_data.get("N")
+            filled_qty = _maybe_dec(get("z"))
+            avg_price = _maybe_dec(get("ap"))
+
+            order_type = get("o")
+            close_position = get("cp")
+            reduce_only = get("R")
+            is_maker = get("m")
+            realized_pnl_raw = get("rp")
+            commission_raw = get("n")
+            commission_asset = get("N")
             realized_pnl: Optional[Decimal] = None
             if realized_pnl_raw is not None:
                 try:
-                    realized_pnl = Decimal(str(realized_pnl_raw))
+                    realized_pnl = parse_ws_decimal(str(realized_pnl_raw))
                 except Exception:
                     realized_pnl = None
             fee: Optional[Decimal] = None
             if commission_raw is not None:
                 try:
-                    fee = Decimal(str(commission_raw))
+                    fee = parse_ws_decimal(str(commission_raw))
                 except Exception:
                     fee = None
 
             # 时间戳
             timestamp_ms = int(data.get("T", 0)) or int(data.get("E", 0)) or current_time_ms()
 
+            # 热路径按字段顺序位置传参（免去关键字参数匹配）；顺序须与 OrderUpdate 字段定义一致
             return OrderUpdate(
-                symbol=symbol,
-                order_id=str(order_data.get("i", "")),
-                client_order_id=str(order_data.get("c", "")),
-                side=side,
-                position_side=position_side,
-                status=status,
-                filled_qty=filled_qty,
-                avg_price=avg_price,
-                timestamp_ms=timestamp_ms,
-                order_type=str(order_type) if order_type is not None else None,
-                close_position=bool(close_position) if isinstance(close_position, bool) else None,
-                reduce_only=bool(reduce_only) if isinstance(reduce_only, bool) else None,
-                is_maker=bool(is_maker) if isinstance(is_maker, bool) else None,
-                realized_pnl=realized_pnl,
-                fee=fee,
-                fee_asset=str(commission_asset) if commission_asset else None,
+                symbol,
+                str(get("i", "")),  # order_id
+                str(get("c", "")),  # client_order_id
+                side,
+                position_side,
+                status,
+                filled_qty,
+                avg_price,
+                timestamp_ms,
+                str(order_type) if order_type is not None else None,  # order_type
+                bool(close_position) if isinstance(close_position, bool) else None,  # close_position
+                bool(reduce_only) if isinstance(reduce_only, bool) else None,  # reduce_only
+                bool(is_maker) if isinstance(is_maker, bool) else None,  # is_maker
+                realized_pnl,
+                fee,
+                str(commission_asset) if commission_asset else None,  # fee_asset
             )
 
         except Exception as e:
@@ -623,37 +675,41 @@ class UserDataWSClient:
         timestamp_ms = int(data.get("T", 0)) or int(data.get("E", 0)) or current_time_ms()
 
         updates: List[PositionUpdate] = []
+        # 循环内高频使用的方法先绑定到局部变量
+        append = updates.append
+        to_symbol = self._ws_to_symbol
         for raw in raw_positions:
             if not isinstance(raw, dict):
                 continue
+            get = raw.get
 
-            ws_symbol = str(raw.get("s", "")).strip()
+            ws_symbol = str(get("s", "")).strip()
             if not ws_symbol:
                 continue
-            symbol = self._ws_to_symbol(ws_symbol)
 
-            ps_str = str(raw.get("ps", "")).upper()
-            if ps_str not in ("LONG", "SHORT"):
+            # 单向持仓（BOTH）等非对冲方向直接跳过
+            position_side = _POSITION_SIDE_MAP.get(str(get("ps", "")).upper())
+            if position_side is None:
                 continue
-            position_side = PositionSide.LONG if ps_str == "LONG" else PositionSide.SHORT
+            symbol = to_symbol(ws_symbol)
 
-            position_amt = Decimal(str(raw.get("pa", "0")))
-            if position_side == PositionSide.LONG:
-                position_amt = abs(position_amt)
-            else:
-                position_amt = -abs(position_amt)
+            # 数量符号以 positionSide 为准：LONG 为正，SHORT 为负
+            position_amt = abs(_maybe_dec(get("pa")))
+            if position_side is PositionSide.SHORT:
+                position_amt = -position_amt
 
-            entry_price = Decimal(str(raw.get("ep", "0")))
-            unrealized_pnl = Decimal(str(raw.get("up", "0")))
+            entry_price = _maybe_dec(get("ep"))
+            unrealized_pnl = _maybe_dec(get("up"))
 
-            updates.append(
+            # 位置传参，顺序同 PositionUpdate 字段定义
+            append(
                 PositionUpdate(
-                    symbol=symbol,
-                    position_side=position_side,
-                    position_amt=position_amt,
-                    entry_price=entry_price if entry_price > Decimal("0") else None,
-                    unrealized_pnl=unrealized_pnl,
-                    timestamp_ms=timestamp_ms,
+                    symbol,
+                    position_side,
+                    position_amt,
+                    entry_price if entry_price > _ZERO else None,  # entry_price
+                    unrealized_pnl,
+                    timestamp_ms,
                 )
             )
 
@@ -692,12 +748,11 @@ class UserDataWSClient:
             for raw in raw_balances:
                 if not isinstance(raw, dict):
                     continue
-                delta_raw = raw.get("bc", "0")
                 try:
-                    delta = Decimal(str(delta_raw))
+                    delta = _maybe_dec(raw.get("bc"))
                 except Exception:
                     continue
-                if delta == Decimal("0"):
+                if delta == _ZERO:
                     continue
                 has_balance_delta = True
                 asset = str(raw.get("a", "")).strip().upper()
@@ -766,20 +821,11 @@ class UserDataWSClient:
 
         "BTCUSDT" -> "BTC/USDT:USDT"
         """
-        from src.utils.helpers import ws_stream_to_symbol
         return ws_stream_to_symbol(ws_symbol)
 
     def _parse_order_status(self, status_str: str) -> OrderStatus:
-        """解析订单状态"""
-        status_map = {
-            "NEW": OrderStatus.NEW,
-            "PARTIALLY_FILLED": OrderStatus.PARTIALLY_FILLED,
-            "FILLED": OrderStatus.FILLED,
-            "CANCELED": OrderStatus.CANCELED,
-            "REJECTED": OrderStatus.REJECTED,
-            "EXPIRED": OrderStatus.EXPIRED,
-        }
-        return status_map.get(status_str, OrderStatus.NEW)
+        """解析订单状态（未知状态按 NEW 处理）"""
+        return _ORDER_STATUS_MAP.get(status_str, OrderStatus.NEW)
 
     async def _reconnect(self) -> None:
         """
@@ -803,10 +849,10 @@ class UserDataWSClient:
             self.max_delay_ms
         )
 
-        # 清理旧连接
+        # 清理旧连接（限时，避免半开连接拖住重连）
         if self._ws:
             try:
-                await self._ws.close()
+                await asyncio.wait_for(self._ws.close(), timeout=WS_CLOSE_TIMEOUT_S)
             except Exception:
                 pass
             self._ws = None
@@ -815,9 +861,11 @@ class UserDataWSClient:
         if self._keepalive_task and not self._keepalive_task.done():
             self._keepalive_task.cancel()
             try:
-                await self._keepalive_task
+                await asyncio.wait_for(self._keepalive_task, timeout=TASK_CANCEL_TIMEOUT_S)
             except asyncio.CancelledError:
                 pass
+            except asyncio.TimeoutError:
+                pass
 
         # 重新连接（重新获取 listenKey）
         self._listen_key = None
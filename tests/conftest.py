@@ -0,0 +1,37 @@
+# Input: pytest 夹具需求
+# Output: 跨测试模块共享的 pytest 夹具（uvloop 事件循环策略 + 轻量交易所桩 + AsyncMock 方法）
+# Pos: 测试共享夹具
+# 一旦我被更新，务必更新我的开头注释，以及所属文件夹的MD。
+
+"""
+测试共享夹具
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+import uvloop
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """全部异步测试跑在 uvloop 上（与应用入口一致，覆盖 pytest-asyncio 默认策略）"""
+    return uvloop.EventLoopPolicy()
+
+
+class _FakeExchange:
+    """交易所桩：只挂保护止损同步路径用到的方法（未挂方法访问直接 AttributeError）"""
+
+    def __init__(self) -> None:
+        # 挂单查询默认返回空列表
+        self.fetch_open_orders = AsyncMock(return_value=[])
+        self.fetch_open_orders_raw = AsyncMock(return_value=[])
+        self.fetch_open_algo_orders = AsyncMock(return_value=[])
+        self.place_order = AsyncMock()
+        self.cancel_algo_order = AsyncMock()
+
+
+@pytest.fixture
+def exchange() -> _FakeExchange:
+    """每个测试一个新桩（新的 AsyncMock）"""
+    return _FakeExchange()
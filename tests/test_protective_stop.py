@@ -7,34 +7,135 @@
 保护性止损（ProtectiveStopManager）单元测试
 """
 
+from collections import deque
+from dataclasses import replace
 from decimal import Decimal
-from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from src.exchange.adapter import ExchangeAdapter
 from src.models import (
     AlgoOrderUpdate,
     OrderIntent,
     OrderResult,
-    OrderStatus,
     OrderSide,
+    OrderStatus,
     OrderType,
     Position,
     PositionSide,
     SymbolRules,
 )
-from src.risk.protective_stop import ProtectiveStopManager
+import src.risk.protective_stop as _ps_mod
+from src.risk.protective_stop import ProtectiveStopManager, ProtectiveStopState
+
+
+# 高频 Decimal 常量（模块级只构造一次，测试中复用）
+D_0 = Decimal("0")
+D_0_01 = Decimal("0.01")
+D_NEG_0_01 = Decimal("-0.01")
+D_100 = Decimal("100")
+D_110 = Decimal("110")
+D_0_1 = Decimal("0.1")
+D_0_001 = Decimal("0.001")
+D_5 = Decimal("5")
+D_0_005 = Decimal("0.005")
+
+BTC_SYMBOL = "BTC/USDT:USDT"
+
+BTC_RULES = SymbolRules(
+    symbol=BTC_SYMBOL,
+    tick_size=D_0_1,
+    step_size=D_0_001,
+    min_qty=D_0_001,
+    min_notional=D_5,
+)
+# 细 tick 规则：用于 float triggerPrice 归一化场景
+BTC_RULES_FINE = SymbolRules(
+    symbol=BTC_SYMBOL,
+    tick_size=D_0_001,
+    step_size=D_0_001,
+    min_qty=D_0_001,
+    min_notional=D_5,
+)
+
+# 保护止损 algo 挂单模板（测试中用 `模板 | {...}` 覆盖 clientAlgoId 等差异字段）
+_ALGO_LONG = {
+    "algoId": "999",
+    "orderType": "STOP_MARKET",
+    "positionSide": "LONG",
+    "closePosition": True,
+    "triggerPrice": "101.1",
+}
+_ALGO_SHORT = {
+    "algoId": "999",
+    "orderType": "STOP_MARKET",
+    "positionSide": "SHORT",
+    "closePosition": True,
+    "triggerPrice": "99.0",
+}
+
+# 只读仓位快照（sync_symbol 不修改传入的 Position；差异字段用 dataclasses.replace 派生）
+_BASE_LONG = Position(
+    symbol=BTC_SYMBOL,
+    position_side=PositionSide.LONG,
+    position_amt=D_0_01,
+    entry_price=D_100,
+    unrealized_pnl=D_0,
+    leverage=10,
+    liquidation_price=D_100,
+    mark_price=D_110,
+)
+_BASE_SHORT = replace(_BASE_LONG, position_side=PositionSide.SHORT, position_amt=D_NEG_0_01)
 
+LONG_POS = {PositionSide.LONG: _BASE_LONG}
+SHORT_POS = {PositionSide.SHORT: _BASE_SHORT}
+SHORT_POS_FINE = {
+    PositionSide.SHORT: replace(
+        _BASE_SHORT,
+        entry_price=Decimal("8.0"),
+        liquidation_price=Decimal("8.391005"),
+        mark_price=Decimal("8.1"),
+    )
+}
 
-class TestProtectiveStopPrice:
-    def test_compute_stop_price_rounding(self):
-        exchange = MagicMock(spec=ExchangeAdapter)
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
 
-        tick = Decimal("0.1")
-        liq = Decimal("100")
-        dist = Decimal("0.01")
+def _assert_no_order_mutations(exchange) -> None:
+    """断言既未下单也未撤单（直接检查调用列表）"""
+    assert not exchange.place_order.call_args_list
+    assert not exchange.cancel_algo_order.call_args_list
+
+
+@pytest.fixture
+def mgr(exchange):
+    """每个测试一个新的 ProtectiveStopManager（绑定当前测试的 exchange 桩）"""
+    return ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
+
+
+@pytest.fixture
+def cids(mgr):
+    """预生成的 clientOrderId（按 symbol+side 索引）"""
+    return {
+        (BTC_SYMBOL, side): mgr.build_client_order_id(BTC_SYMBOL, side)
+        for side in (PositionSide.LONG, PositionSide.SHORT)
+    }
+
+
+@pytest.fixture
+def log_events(monkeypatch):
+    """替换保护止损模块的 log_event，返回收集到的事件 kwargs"""
+    events: deque[dict] = deque()
+
+    def fake_log_event(*_args, **kwargs):
+        events.append(kwargs)
+
+    monkeypatch.setattr(_ps_mod, "log_event", fake_log_event)
+    return events
+
+
+class TestProtectiveStopPrice:
+    def test_compute_stop_price_rounding(self, mgr):
+        tick = D_0_1
+        liq = D_100
+        dist = D_0_01
 
         long_stop = mgr.compute_stop_price(
             position_side=PositionSide.LONG,
@@ -55,814 +156,344 @@ class TestProtectiveStopPrice:
         assert short_stop == Decimal("99.0")
 
 
-@pytest.mark.asyncio
-class TestProtectiveStopSync:
-    async def test_sync_places_order_when_missing(self):
-        exchange = MagicMock(spec=ExchangeAdapter)
-        exchange.fetch_open_orders = AsyncMock(return_value=[])
-        exchange.fetch_open_orders_raw = AsyncMock(return_value=[])
-        exchange.fetch_open_algo_orders = AsyncMock(return_value=[])
-        exchange.place_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
-        )
-        exchange.cancel_algo_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.CANCELED)
-        )
-
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
-        symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
-        positions = {
-            PositionSide.LONG: Position(
-                symbol=symbol,
-                position_side=PositionSide.LONG,
-                position_amt=Decimal("0.01"),
-                entry_price=Decimal("100"),
-                unrealized_pnl=Decimal("0"),
-                leverage=10,
-                liquidation_price=Decimal("100"),
-                mark_price=Decimal("110"),
-            )
-        }
-
-        await mgr.sync_symbol(
-            symbol=symbol,
-            rules=rules,
-            positions=positions,
-            enabled=True,
-            dist_to_liq=Decimal("0.01"),
-        )
-
-        exchange.place_order.assert_called_once()
-        intent: OrderIntent = exchange.place_order.call_args.args[0]
-        assert intent.order_type == OrderType.STOP_MARKET
-        assert intent.close_position is True
-        assert intent.stop_price == Decimal("101.1")
-        assert intent.is_risk is True
-
-    async def test_sync_does_not_relax_long_stop_price(self):
-        """LONG 只允许收紧：stopPrice 不允许下调（更松/更远）。"""
-        exchange = MagicMock(spec=ExchangeAdapter)
-        exchange.fetch_open_orders = AsyncMock(return_value=[])
-        exchange.fetch_open_orders_raw = AsyncMock(return_value=[])
-        exchange.fetch_open_algo_orders = AsyncMock(
-            return_value=[
-                {
-                    "algoId": "999",
-                    "clientAlgoId": "vq-ps-btcusdt-L-12345",
-                    "orderType": "STOP_MARKET",
-                    "positionSide": "LONG",
-                    "closePosition": True,
-                    "triggerPrice": "101.1",
-                }
-            ]
-        )
-        exchange.place_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
-        )
-        exchange.cancel_algo_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="999", status=OrderStatus.CANCELED)
-        )
-
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
-        symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
-        positions = {
-            PositionSide.LONG: Position(
-                symbol=symbol,
-                position_side=PositionSide.LONG,
-                position_amt=Decimal("0.01"),
-                entry_price=Decimal("100"),
-                unrealized_pnl=Decimal("0"),
-                leverage=10,
-                liquidation_price=Decimal("100"),
-                mark_price=Decimal("110"),
-            )
-        }
-
-        # dist 变小会让 desired stopPrice 更低（更松）；应跳过更新
-        await mgr.sync_symbol(
-            symbol=symbol,
-            rules=rules,
-            positions=positions,
-            enabled=True,
-            dist_to_liq=Decimal("0.005"),
-        )
-
-        exchange.cancel_algo_order.assert_not_called()
-        exchange.place_order.assert_not_called()
-
-    async def test_sync_does_not_relax_short_stop_price(self):
-        """SHORT 只允许收紧：stopPrice 不允许上调（更松/更远）。"""
-        exchange = MagicMock(spec=ExchangeAdapter)
-        exchange.fetch_open_orders = AsyncMock(return_value=[])
-        exchange.fetch_open_orders_raw = AsyncMock(return_value=[])
-        exchange.fetch_open_algo_orders = AsyncMock(
-            return_value=[
-                {
-                    "algoId": "999",
-                    "clientAlgoId": "vq-ps-btcusdt-S-12345",
-                    "orderType": "STOP_MARKET",
-                    "positionSide": "SHORT",
-                    "closePosition": True,
-                    "triggerPrice": "99.0",
-                }
-            ]
-        )
-        exchange.place_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
-        )
-        exchange.cancel_algo_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="999", status=OrderStatus.CANCELED)
-        )
-
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
-        symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
-        positions = {
-            PositionSide.SHORT: Position(
-                symbol=symbol,
-                position_side=PositionSide.SHORT,
-                position_amt=Decimal("-0.01"),
-                entry_price=Decimal("100"),
-                unrealized_pnl=Decimal("0"),
-                leverage=10,
-                liquidation_price=Decimal("100"),
-                mark_price=Decimal("110"),
-            )
-        }
-
-        # dist 变小会让 desired stopPrice 更高（更松）；应跳过更新
-        await mgr.sync_symbol(
-            symbol=symbol,
-            rules=rules,
-            positions=positions,
-            enabled=True,
-            dist_to_liq=Decimal("0.005"),
-        )
-
-        exchange.cancel_algo_order.assert_not_called()
-        exchange.place_order.assert_not_called()
-
-    async def test_sync_cancels_order_when_no_position(self):
-        exchange = MagicMock(spec=ExchangeAdapter)
-        symbol = "BTC/USDT:USDT"
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
-        cid = mgr.build_client_order_id(symbol, PositionSide.LONG)
-
-        exchange.fetch_open_orders = AsyncMock(
-            return_value=[
-                {
-                    "id": "123",
-                    "clientOrderId": cid,
-                    "stopPrice": "101.1",
-                    "info": {"positionSide": "LONG", "clientOrderId": cid, "stopPrice": "101.1"},
-                }
-            ]
-        )
-        exchange.fetch_open_orders_raw = AsyncMock(
-            return_value=[
-                {
-                    "id": "123",
-                    "clientOrderId": cid,
-                    "stopPrice": "101.1",
-                    "info": {"positionSide": "LONG", "clientOrderId": cid, "stopPrice": "101.1"},
-                }
-            ]
-        )
-        exchange.fetch_open_algo_orders = AsyncMock(return_value=[])
-        exchange.cancel_algo_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="123", status=OrderStatus.CANCELED)
-        )
-        exchange.place_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
-        )
-
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
-
-        await mgr.sync_symbol(
-            symbol=symbol,
-            rules=rules,
-            positions={},  # 无仓位
-            enabled=True,
-            dist_to_liq=Decimal("0.01"),
-        )
-
-        exchange.cancel_algo_order.assert_called_once_with(symbol, "123")
-        exchange.place_order.assert_not_called()
-
-    async def test_sync_skips_when_external_close_position_algo_exists(self):
-        exchange = MagicMock(spec=ExchangeAdapter)
-        exchange.fetch_open_orders = AsyncMock(return_value=[])
-        exchange.fetch_open_orders_raw = AsyncMock(return_value=[])
-        exchange.fetch_open_algo_orders = AsyncMock(
-            return_value=[
-                {
-                    "algoId": "999",
-                    "clientAlgoId": "external-stop-abc",
-                    "orderType": "STOP_MARKET",
-                    "positionSide": "LONG",
-                    "closePosition": True,
-                    "triggerPrice": "101.1",
-                }
-            ]
-        )
-        exchange.place_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
-        )
-        exchange.cancel_algo_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.CANCELED)
-        )
-
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
-        symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
-        positions = {
-            PositionSide.LONG: Position(
-                symbol=symbol,
-                position_side=PositionSide.LONG,
-                position_amt=Decimal("0.01"),
-                entry_price=Decimal("100"),
-                unrealized_pnl=Decimal("0"),
-                leverage=10,
-                liquidation_price=Decimal("100"),
-                mark_price=Decimal("110"),
-            )
+async def test_sync_places_order_when_missing(exchange, mgr):
+    exchange.place_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
+    exchange.cancel_algo_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.CANCELED)
+
+    symbol = "BTC/USDT:USDT"
+    rules = BTC_RULES
+    positions = LONG_POS
+
+    await mgr.sync_symbol(
+        symbol=symbol,
+        rules=rules,
+        positions=positions,
+        enabled=True,
+        dist_to_liq=D_0_01,
+    )
+
+    exchange.place_order.assert_called_once()
+    intent: OrderIntent = exchange.place_order.await_args[0][0]
+    assert intent.order_type == OrderType.STOP_MARKET
+    assert intent.close_position is True
+    assert intent.stop_price == Decimal("101.1")
+    assert intent.is_risk is True
+
+
+@pytest.mark.parametrize(
+    "positions,algo_order",
+    [
+        (LONG_POS, _ALGO_LONG | {"clientAlgoId": "vq-ps-btcusdt-L-12345"}),
+        (SHORT_POS, _ALGO_SHORT | {"clientAlgoId": "vq-ps-btcusdt-S-12345"}),
+    ],
+    ids=["long", "short"],
+)
+async def test_sync_does_not_relax_stop_price(exchange, mgr, positions, algo_order):
+    """只允许收紧：LONG stopPrice 不允许下调，SHORT stopPrice 不允许上调（更松/更远）。"""
+    exchange.fetch_open_algo_orders.return_value = [algo_order]
+    exchange.place_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
+    exchange.cancel_algo_order.return_value = OrderResult(success=True, order_id="999", status=OrderStatus.CANCELED)
+
+    # dist 变小会让 desired stopPrice 更松；应跳过更新
+    await mgr.sync_symbol(
+        symbol="BTC/USDT:USDT",
+        rules=BTC_RULES,
+        positions=positions,
+        enabled=True,
+        dist_to_liq=D_0_005,
+    )
+
+    _assert_no_order_mutations(exchange)
+
+
+async def test_sync_treats_null_algo_orders_as_fetch_failure(exchange, mgr):
+    """algo 挂单接口返回 None（data: null）时按获取失败处理，不下单也不抛出"""
+    exchange.fetch_open_algo_orders.return_value = None
+
+    result = await mgr.sync_symbol(
+        symbol="BTC/USDT:USDT",
+        rules=BTC_RULES,
+        positions=LONG_POS,
+        enabled=True,
+        dist_to_liq=D_0_005,
+    )
+
+    assert result == {PositionSide.LONG: False, PositionSide.SHORT: False}
+    _assert_no_order_mutations(exchange)
+
+
+async def test_sync_cancels_order_when_no_position(exchange, mgr, cids):
+    symbol = "BTC/USDT:USDT"
+    cid = cids[(symbol, PositionSide.LONG)]
+
+    open_orders = [
+        {
+            "id": "123",
+            "clientOrderId": cid,
+            "stopPrice": "101.1",
+            "info": {"positionSide": "LONG", "clientOrderId": cid, "stopPrice": "101.1"},
         }
-
-        await mgr.sync_symbol(
-            symbol=symbol,
-            rules=rules,
-            positions=positions,
-            enabled=True,
-            dist_to_liq=Decimal("0.01"),
-        )
-
-        exchange.place_order.assert_not_called()
-
-    async def test_sync_skips_when_external_reduce_only_stop_exists(self):
-        exchange = MagicMock(spec=ExchangeAdapter)
-        exchange.fetch_open_orders = AsyncMock(
-            return_value=[
+    ]
+    exchange.fetch_open_orders.return_value = open_orders
+    exchange.fetch_open_orders_raw.return_value = open_orders
+    exchange.cancel_algo_order.return_value = OrderResult(success=True, order_id="123", status=OrderStatus.CANCELED)
+    exchange.place_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
+
+    rules = BTC_RULES
+
+    await mgr.sync_symbol(
+        symbol=symbol,
+        rules=rules,
+        positions={},  # 无仓位
+        enabled=True,
+        dist_to_liq=D_0_01,
+    )
+
+    exchange.cancel_algo_order.assert_called_once_with(symbol, "123")
+    exchange.place_order.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "positions,open_orders,algo_orders",
+    [
+        # 外部 closePosition algo 条件单
+        (LONG_POS, [], [_ALGO_LONG | {"clientAlgoId": "external-stop-abc"}]),
+        # 外部 reduceOnly 普通条件单
+        (
+            SHORT_POS,
+            [
                 {
                     "id": "ext-1",
                     "type": "stop_market",
                     "reduceOnly": True,
-                    "info": {"positionSide": "SHORT", "reduceOnly": True},
-                }
-            ]
-        )
-        exchange.fetch_open_orders_raw = AsyncMock(
-            return_value=[
-                {
-                    "id": "ext-1",
-                    "type": "stop_market",
-                    "reduceOnly": True,
-                    "info": {"positionSide": "SHORT", "reduceOnly": True},
-                }
-            ]
-        )
-        exchange.fetch_open_algo_orders = AsyncMock(return_value=[])
-        exchange.place_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
-        )
-        exchange.cancel_algo_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.CANCELED)
-        )
-
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
-        symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
-        positions = {
-            PositionSide.SHORT: Position(
-                symbol=symbol,
-                position_side=PositionSide.SHORT,
-                position_amt=Decimal("-0.01"),
-                entry_price=Decimal("100"),
-                unrealized_pnl=Decimal("0"),
-                leverage=10,
-                liquidation_price=Decimal("100"),
-                mark_price=Decimal("110"),
-            )
-        }
-
-        await mgr.sync_symbol(
-            symbol=symbol,
-            rules=rules,
-            positions=positions,
-            enabled=True,
-            dist_to_liq=Decimal("0.01"),
-        )
-
-        exchange.place_order.assert_not_called()
-
-    async def test_sync_logs_when_multiple_external_stops_exist(self, monkeypatch):
-        events: list[dict] = []
-
-        def fake_log_event(*_args, **kwargs):
-            events.append(kwargs)
-
-        monkeypatch.setattr("src.risk.protective_stop.log_event", fake_log_event)
-
-        exchange = MagicMock(spec=ExchangeAdapter)
-        exchange.fetch_open_orders = AsyncMock(
-            return_value=[
-                {"id": "ext-1", "type": "stop_market", "reduceOnly": True, "info": {"positionSide": "SHORT"}},
-                {"id": "ext-2", "type": "stop_market", "reduceOnly": True, "info": {"positionSide": "SHORT"}},
-            ]
-        )
-        exchange.fetch_open_orders_raw = AsyncMock(
-            return_value=[
-                {"id": "ext-1", "type": "stop_market", "reduceOnly": True, "info": {"positionSide": "SHORT"}},
-                {"id": "ext-2", "type": "stop_market", "reduceOnly": True, "info": {"positionSide": "SHORT"}},
-            ]
-        )
-        exchange.fetch_open_algo_orders = AsyncMock(return_value=[])
-        exchange.place_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
-        )
-
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
-        symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
-        positions = {
-            PositionSide.SHORT: Position(
-                symbol=symbol,
-                position_side=PositionSide.SHORT,
-                position_amt=Decimal("-0.01"),
-                entry_price=Decimal("100"),
-                unrealized_pnl=Decimal("0"),
-                leverage=10,
-                liquidation_price=Decimal("100"),
-                mark_price=Decimal("110"),
-            )
-        }
-
-        await mgr.sync_symbol(
-            symbol=symbol,
-            rules=rules,
-            positions=positions,
-            enabled=True,
-            dist_to_liq=Decimal("0.01"),
-        )
-
-        assert any(e.get("reason") == "external_stop_multiple" and e.get("count") == 2 for e in events)
-        exchange.place_order.assert_not_called()
-
-    async def test_sync_startup_logs_existing_external_stop(self, monkeypatch):
-        """启动同步时，若已存在外部 closePosition 条件单，应打印一次可读日志。"""
-        events: list[dict] = []
-
-        def fake_log_event(*_args, **kwargs):
-            events.append(kwargs)
-
-        monkeypatch.setattr("src.risk.protective_stop.log_event", fake_log_event)
-
-        exchange = MagicMock(spec=ExchangeAdapter)
-        exchange.fetch_open_orders = AsyncMock(return_value=[])
-        exchange.fetch_open_orders_raw = AsyncMock(return_value=[])
-        exchange.fetch_open_algo_orders = AsyncMock(
-            return_value=[
-                {
-                    "algoId": "999",
-                    "clientAlgoId": "external-stop-abc",
-                    "orderType": "STOP_MARKET",
-                    "positionSide": "LONG",
-                    "closePosition": True,
-                    "triggerPrice": "101.1",
-                }
-            ]
-        )
-        exchange.place_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
-        )
-        exchange.cancel_algo_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.CANCELED)
-        )
-
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
-        symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
-        positions = {
-            PositionSide.LONG: Position(
-                symbol=symbol,
-                position_side=PositionSide.LONG,
-                position_amt=Decimal("0.01"),
-                entry_price=Decimal("100"),
-                unrealized_pnl=Decimal("0"),
-                leverage=10,
-                liquidation_price=Decimal("100"),
-                mark_price=Decimal("110"),
-            )
-        }
-
-        await mgr.sync_symbol(
-            symbol=symbol,
-            rules=rules,
-            positions=positions,
-            enabled=True,
-            dist_to_liq=Decimal("0.01"),
-            sync_reason="startup",
-        )
-
-        assert any(e.get("reason") == "startup_existing_external_stop" for e in events)
-        exchange.place_order.assert_not_awaited()
-        exchange.place_order.assert_not_called()
-
-    async def test_sync_cancels_own_order_when_external_close_position_exists(self):
-        exchange = MagicMock(spec=ExchangeAdapter)
-        symbol = "BTC/USDT:USDT"
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
-        own_cid = mgr.build_client_order_id(symbol, PositionSide.LONG)
-
-        exchange.fetch_open_orders = AsyncMock(
-            return_value=[
-                {
-                    "id": "123",
-                    "clientOrderId": own_cid,
-                    "stopPrice": "101.1",
-                    "info": {"positionSide": "LONG", "clientOrderId": own_cid, "stopPrice": "101.1"},
-                }
-            ]
-        )
-        exchange.fetch_open_orders_raw = AsyncMock(
-            return_value=[
-                {
-                    "id": "123",
-                    "clientOrderId": own_cid,
-                    "stopPrice": "101.1",
-                    "info": {"positionSide": "LONG", "clientOrderId": own_cid, "stopPrice": "101.1"},
-                }
-            ]
-        )
-        exchange.fetch_open_algo_orders = AsyncMock(
-            return_value=[
-                {
-                    "algoId": "999",
-                    "clientAlgoId": "external-stop-abc",
-                    "orderType": "STOP_MARKET",
-                    "positionSide": "LONG",
-                    "closePosition": True,
-                    "triggerPrice": "101.1",
-                }
-            ]
-        )
-        exchange.place_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
-        )
-        exchange.cancel_algo_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="123", status=OrderStatus.CANCELED)
-        )
-
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
-        positions = {
-            PositionSide.LONG: Position(
-                symbol=symbol,
-                position_side=PositionSide.LONG,
-                position_amt=Decimal("0.01"),
-                entry_price=Decimal("100"),
-                unrealized_pnl=Decimal("0"),
-                leverage=10,
-                liquidation_price=Decimal("100"),
-                mark_price=Decimal("110"),
-            )
-        }
-
-        await mgr.sync_symbol(
-            symbol=symbol,
-            rules=rules,
-            positions=positions,
-            enabled=True,
-            dist_to_liq=Decimal("0.01"),
-        )
-
-        exchange.cancel_algo_order.assert_called_once_with(symbol, "123")
-        exchange.place_order.assert_not_called()
-
-    async def test_sync_does_not_churn_on_float_trigger_price(self):
-        """交易所若以 float 返回 triggerPrice，需按 tick 归一化避免反复撤旧建新。"""
-        exchange = MagicMock(spec=ExchangeAdapter)
-        exchange.fetch_open_orders = AsyncMock(return_value=[])
-        exchange.fetch_open_orders_raw = AsyncMock(return_value=[])
-
-        # 模拟 ccxt/交易所返回 float 抖动：8.267 -> 8.266999999999999
-        exchange.fetch_open_algo_orders = AsyncMock(
-            return_value=[
-                {
-                    "algoId": "999",
-                    "clientAlgoId": "vq-ps-btcusdt-S-12345",
-                    "orderType": "STOP_MARKET",
-                    "positionSide": "SHORT",
-                    "closePosition": True,
-                    "triggerPrice": 8.266999999999999,
-                }
-            ]
-        )
-        exchange.place_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
-        )
-        exchange.cancel_algo_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="999", status=OrderStatus.CANCELED)
-        )
-
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
-        symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.001"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
-        positions = {
-            PositionSide.SHORT: Position(
-                symbol=symbol,
-                position_side=PositionSide.SHORT,
-                position_amt=Decimal("-0.01"),
-                entry_price=Decimal("8.0"),
-                unrealized_pnl=Decimal("0"),
-                leverage=10,
-                # 使 desired_stop_price=8.267：liq = 8.267 * (1 + 0.015)
-                liquidation_price=Decimal("8.391005"),
-                mark_price=Decimal("8.1"),
-            )
-        }
-
-        await mgr.sync_symbol(
-            symbol=symbol,
-            rules=rules,
-            positions=positions,
-            enabled=True,
-            dist_to_liq=Decimal("0.015"),
-        )
-
-        exchange.cancel_algo_order.assert_not_called()
-        exchange.place_order.assert_not_called()
+                    "info": {"positionSide": "SHORT", "reduceOnly": True},
+                }
+            ],
+            [],
+        ),
+    ],
+    ids=["close_position_algo", "reduce_only_stop"],
+)
+async def test_sync_skips_when_external_stop_exists(exchange, mgr, positions, open_orders, algo_orders):
+    exchange.fetch_open_orders.return_value = open_orders
+    exchange.fetch_open_orders_raw.return_value = open_orders
+    exchange.fetch_open_algo_orders.return_value = algo_orders
+    exchange.place_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
+    exchange.cancel_algo_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.CANCELED)
+
+    await mgr.sync_symbol(
+        symbol="BTC/USDT:USDT",
+        rules=BTC_RULES,
+        positions=positions,
+        enabled=True,
+        dist_to_liq=D_0_01,
+    )
+
+    exchange.place_order.assert_not_called()
+
+
+async def test_sync_logs_when_multiple_external_stops_exist(exchange, mgr, log_events):
+    open_orders = [
+        {"id": "ext-1", "type": "stop_market", "reduceOnly": True, "info": {"positionSide": "SHORT"}},
+        {"id": "ext-2", "type": "stop_market", "reduceOnly": True, "info": {"positionSide": "SHORT"}},
+    ]
+    exchange.fetch_open_orders.return_value = open_orders
+    exchange.fetch_open_orders_raw.return_value = open_orders
+    exchange.place_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
+
+    symbol = "BTC/USDT:USDT"
+    rules = BTC_RULES
+    positions = SHORT_POS
+
+    await mgr.sync_symbol(
+        symbol=symbol,
+        rules=rules,
+        positions=positions,
+        enabled=True,
+        dist_to_liq=D_0_01,
+    )
+
+    assert any(e.get("reason") == "external_stop_multiple" and e.get("count") == 2 for e in log_events)
+    exchange.place_order.assert_not_called()
+
+
+async def test_sync_startup_logs_existing_external_stop(exchange, mgr, log_events):
+    """启动同步时，若已存在外部 closePosition 条件单，应打印一次可读日志。"""
+    exchange.fetch_open_algo_orders.return_value = [_ALGO_LONG | {"clientAlgoId": "external-stop-abc"}]
+    exchange.place_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
+    exchange.cancel_algo_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.CANCELED)
+
+    symbol = "BTC/USDT:USDT"
+    rules = BTC_RULES
+    positions = LONG_POS
+
+    await mgr.sync_symbol(
+        symbol=symbol,
+        rules=rules,
+        positions=positions,
+        enabled=True,
+        dist_to_liq=D_0_01,
+        sync_reason="startup",
+    )
+
+    assert any(e.get("reason") == "startup_existing_external_stop" for e in log_events)
+    exchange.place_order.assert_not_awaited()
+    exchange.place_order.assert_not_called()
+
+
+async def test_sync_cancels_own_order_when_external_close_position_exists(exchange, mgr, cids):
+    symbol = "BTC/USDT:USDT"
+    own_cid = cids[(symbol, PositionSide.LONG)]
+
+    open_orders = [
+        {
+            "id": "123",
+            "clientOrderId": own_cid,
+            "stopPrice": "101.1",
+            "info": {"positionSide": "LONG", "clientOrderId": own_cid, "stopPrice": "101.1"},
+        }
+    ]
+    exchange.fetch_open_orders.return_value = open_orders
+    exchange.fetch_open_orders_raw.return_value = open_orders
+    exchange.fetch_open_algo_orders.return_value = [_ALGO_LONG | {"clientAlgoId": "external-stop-abc"}]
+    exchange.place_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
+    exchange.cancel_algo_order.return_value = OrderResult(success=True, order_id="123", status=OrderStatus.CANCELED)
 
-    async def test_sync_skips_when_ws_external_hint_active(self):
-        """外部接管锁存时，不应下我们自己的保护止损。"""
-        exchange = MagicMock(spec=ExchangeAdapter)
-        exchange.fetch_open_orders = AsyncMock(return_value=[])
-        exchange.fetch_open_orders_raw = AsyncMock(return_value=[])
-        exchange.fetch_open_algo_orders = AsyncMock(return_value=[])
-        exchange.place_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
-        )
+    rules = BTC_RULES
+    positions = LONG_POS
 
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
-        symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
-        positions = {
-            PositionSide.LONG: Position(
-                symbol=symbol,
-                position_side=PositionSide.LONG,
-                position_amt=Decimal("0.01"),
-                entry_price=Decimal("100"),
-                unrealized_pnl=Decimal("0"),
-                leverage=10,
-                liquidation_price=Decimal("100"),
-                mark_price=Decimal("110"),
-            )
-        }
+    await mgr.sync_symbol(
+        symbol=symbol,
+        rules=rules,
+        positions=positions,
+        enabled=True,
+        dist_to_liq=D_0_01,
+    )
 
-        await mgr.sync_symbol(
-            symbol=symbol,
-            rules=rules,
-            positions=positions,
-            enabled=True,
-            dist_to_liq=Decimal("0.01"),
-            external_stop_latch_by_side={PositionSide.LONG: True},
-        )
+    exchange.cancel_algo_order.assert_called_once_with(symbol, "123")
+    exchange.place_order.assert_not_called()
 
-        exchange.place_order.assert_not_called()
 
-    async def test_sync_does_not_modify_existing_order_during_ws_hint(self):
-        """外部接管锁存时，已有我们自己的保护止损单应短暂保留，不撤不建。"""
-        exchange = MagicMock(spec=ExchangeAdapter)
-        exchange.fetch_open_orders = AsyncMock(return_value=[])
-        exchange.fetch_open_orders_raw = AsyncMock(return_value=[])
+async def test_sync_does_not_churn_on_float_trigger_price(exchange, mgr):
+    """交易所若以 float 返回 triggerPrice，需按 tick 归一化避免反复撤旧建新。"""
 
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
-        symbol = "BTC/USDT:USDT"
-        cid = mgr.build_client_order_id(symbol, PositionSide.SHORT)
+    # 模拟 ccxt/交易所返回 float 抖动：8.267 -> 8.266999999999999
+    exchange.fetch_open_algo_orders.return_value = [
+        _ALGO_SHORT | {"clientAlgoId": "vq-ps-btcusdt-S-12345", "triggerPrice": 8.266999999999999}
+    ]
+    exchange.place_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
+    exchange.cancel_algo_order.return_value = OrderResult(success=True, order_id="999", status=OrderStatus.CANCELED)
 
-        exchange.fetch_open_algo_orders = AsyncMock(
-            return_value=[
-                {
-                    "algoId": "999",
-                    "clientAlgoId": cid,
-                    "orderType": "STOP_MARKET",
-                    "positionSide": "SHORT",
-                    "closePosition": True,
-                    "triggerPrice": "99.0",
-                }
-            ]
-        )
-        exchange.place_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
-        )
-        exchange.cancel_algo_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="999", status=OrderStatus.CANCELED)
-        )
+    symbol = "BTC/USDT:USDT"
+    rules = BTC_RULES_FINE
+    # 使 desired_stop_price=8.267：liq = 8.267 * (1 + 0.015)
+    positions = SHORT_POS_FINE
 
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
-        positions = {
-            PositionSide.SHORT: Position(
-                symbol=symbol,
-                position_side=PositionSide.SHORT,
-                position_amt=Decimal("-0.01"),
-                entry_price=Decimal("100"),
-                unrealized_pnl=Decimal("0"),
-                leverage=10,
-                liquidation_price=Decimal("100"),
-                mark_price=Decimal("110"),
-            )
-        }
+    await mgr.sync_symbol(
+        symbol=symbol,
+        rules=rules,
+        positions=positions,
+        enabled=True,
+        dist_to_liq=Decimal("0.015"),
+    )
 
-        await mgr.sync_symbol(
-            symbol=symbol,
-            rules=rules,
-            positions=positions,
-            enabled=True,
-            dist_to_liq=Decimal("0.01"),
-            external_stop_latch_by_side={PositionSide.SHORT: True},
-        )
+    _assert_no_order_mutations(exchange)
 
-        exchange.cancel_algo_order.assert_not_called()
-        exchange.place_order.assert_not_called()
 
+async def test_sync_skips_when_ws_external_hint_active(exchange, mgr):
+    """外部接管锁存时，不应下我们自己的保护止损。"""
+    exchange.place_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
 
-class TestOnAlgoOrderUpdate:
-    """测试 on_algo_order_update 方法（清理本地状态）。"""
+    symbol = "BTC/USDT:USDT"
+    rules = BTC_RULES
+    positions = LONG_POS
 
-    def test_clears_state_on_canceled(self):
-        """Algo Order 被撤销时，应清理本地 _states。"""
-        exchange = MagicMock(spec=ExchangeAdapter)
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
-        symbol = "BTC/USDT:USDT"
+    await mgr.sync_symbol(
+        symbol=symbol,
+        rules=rules,
+        positions=positions,
+        enabled=True,
+        dist_to_liq=D_0_01,
+        external_stop_latch_by_side={PositionSide.LONG: True},
+    )
 
-        # 模拟已有本地状态
-        cid = mgr.build_client_order_id(symbol, PositionSide.LONG)
-        from src.risk.protective_stop import ProtectiveStopState
-        mgr._states[(symbol, PositionSide.LONG)] = ProtectiveStopState(
-            symbol=symbol,
-            position_side=PositionSide.LONG,
-            client_order_id=cid,
-            order_id="123",
-        )
+    exchange.place_order.assert_not_called()
 
-        # 模拟 ALGO_UPDATE: CANCELED
-        update = AlgoOrderUpdate(
-            symbol=symbol,
-            algo_id="123",
-            client_algo_id=cid,
-            side=OrderSide.SELL,
-            status="CANCELED",
-            timestamp_ms=1234567890,
-        )
 
-        mgr.on_algo_order_update(update)
+async def test_sync_does_not_modify_existing_order_during_ws_hint(exchange, mgr, cids):
+    """外部接管锁存时，已有我们自己的保护止损单应短暂保留，不撤不建。"""
 
-        # 状态应被清理
-        assert (symbol, PositionSide.LONG) not in mgr._states
+    symbol = "BTC/USDT:USDT"
+    cid = cids[(symbol, PositionSide.SHORT)]
 
-    def test_clears_state_on_triggered(self):
-        """Algo Order 被触发时，应清理本地 _states。"""
-        exchange = MagicMock(spec=ExchangeAdapter)
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
-        symbol = "ETH/USDT:USDT"
+    exchange.fetch_open_algo_orders.return_value = [_ALGO_SHORT | {"clientAlgoId": cid}]
+    exchange.place_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
+    exchange.cancel_algo_order.return_value = OrderResult(success=True, order_id="999", status=OrderStatus.CANCELED)
 
-        cid = mgr.build_client_order_id(symbol, PositionSide.SHORT)
-        from src.risk.protective_stop import ProtectiveStopState
-        mgr._states[(symbol, PositionSide.SHORT)] = ProtectiveStopState(
-            symbol=symbol,
-            position_side=PositionSide.SHORT,
-            client_order_id=cid,
-            order_id="456",
-        )
+    rules = BTC_RULES
+    positions = SHORT_POS
 
-        update = AlgoOrderUpdate(
-            symbol=symbol,
-            algo_id="456",
-            client_algo_id=cid,
-            side=OrderSide.BUY,
-            status="TRIGGERED",
-            timestamp_ms=1234567890,
-        )
+    await mgr.sync_symbol(
+        symbol=symbol,
+        rules=rules,
+        positions=positions,
+        enabled=True,
+        dist_to_liq=D_0_01,
+        external_stop_latch_by_side={PositionSide.SHORT: True},
+    )
 
-        mgr.on_algo_order_update(update)
+    _assert_no_order_mutations(exchange)
 
-        assert (symbol, PositionSide.SHORT) not in mgr._states
 
-    def test_ignores_non_terminal_status(self):
-        """非终态（如 NEW）不应清理 _states。"""
-        exchange = MagicMock(spec=ExchangeAdapter)
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
-        symbol = "BTC/USDT:USDT"
+class TestOnAlgoOrderUpdate:
+    """测试 on_algo_order_update 方法（清理本地状态）。"""
 
-        cid = mgr.build_client_order_id(symbol, PositionSide.LONG)
-        from src.risk.protective_stop import ProtectiveStopState
-        mgr._states[(symbol, PositionSide.LONG)] = ProtectiveStopState(
+    @staticmethod
+    def _seed_state(mgr: ProtectiveStopManager, symbol: str, side: PositionSide) -> str:
+        """写入一条本地保护止损状态，返回其 clientOrderId。"""
+        cid = mgr.build_client_order_id(symbol, side)
+        mgr._states[(symbol, side)] = ProtectiveStopState(
             symbol=symbol,
-            position_side=PositionSide.LONG,
+            position_side=side,
             client_order_id=cid,
             order_id="123",
         )
+        return cid
+
+    @pytest.mark.parametrize("position_side", [PositionSide.LONG, PositionSide.SHORT])
+    @pytest.mark.parametrize(
+        "status,cleared",
+        [
+            ("CANCELED", True),
+            ("TRIGGERED", True),
+            ("FILLED", True),
+            ("EXPIRED", True),
+            ("NEW", False),  # 非终态
+        ],
+    )
+    def test_clears_state_on_terminal_status(self, mgr, position_side, status, cleared):
+        """Algo Order 进入终态时清理本地 _states，非终态保留。"""
+        symbol = "BTC/USDT:USDT"
+        cid = self._seed_state(mgr, symbol, position_side)
 
         update = AlgoOrderUpdate(
             symbol=symbol,
             algo_id="123",
             client_algo_id=cid,
-            side=OrderSide.SELL,
-            status="NEW",  # 非终态
+            side=OrderSide.SELL if position_side == PositionSide.LONG else OrderSide.BUY,
+            status=status,
             timestamp_ms=1234567890,
         )
 
         mgr.on_algo_order_update(update)
 
-        # 状态应保留
-        assert (symbol, PositionSide.LONG) in mgr._states
+        assert ((symbol, position_side) not in mgr._states) is cleared
 
-    def test_ignores_non_matching_prefix(self):
+    def test_ignores_non_matching_prefix(self, mgr):
         """不匹配前缀的订单不应清理 _states。"""
-        exchange = MagicMock(spec=ExchangeAdapter)
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
         symbol = "BTC/USDT:USDT"
 
-        cid = mgr.build_client_order_id(symbol, PositionSide.LONG)
-        from src.risk.protective_stop import ProtectiveStopState
-        mgr._states[(symbol, PositionSide.LONG)] = ProtectiveStopState(
-            symbol=symbol,
-            position_side=PositionSide.LONG,
-            client_order_id=cid,
-            order_id="123",
-        )
+        self._seed_state(mgr, symbol, PositionSide.LONG)
 
         # 外部订单（不匹配前缀）
         update = AlgoOrderUpdate(
@@ -883,133 +514,90 @@ class TestOnAlgoOrderUpdate:
 class TestStopPriceValidation:
     """止损价有效性检查测试"""
 
-    def test_long_valid_stop_price(self):
+    def test_long_valid_stop_price(self, mgr):
         """LONG 止损价高于爆仓价时有效"""
-        exchange = MagicMock(spec=ExchangeAdapter)
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
 
         # 止损价 101 > 爆仓价 100 * 1.0001 = 100.01
         assert mgr.is_stop_price_valid(
             position_side=PositionSide.LONG,
             stop_price=Decimal("101"),
-            liquidation_price=Decimal("100"),
+            liquidation_price=D_100,
         ) is True
 
-    def test_long_invalid_stop_price_below_liq(self):
+    def test_long_invalid_stop_price_below_liq(self, mgr):
         """LONG 止损价低于爆仓价时无效"""
-        exchange = MagicMock(spec=ExchangeAdapter)
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
 
         # 止损价 99 < 爆仓价 100
         assert mgr.is_stop_price_valid(
             position_side=PositionSide.LONG,
             stop_price=Decimal("99"),
-            liquidation_price=Decimal("100"),
+            liquidation_price=D_100,
         ) is False
 
-    def test_long_invalid_stop_price_too_close(self):
+    def test_long_invalid_stop_price_too_close(self, mgr):
         """LONG 止损价接近爆仓价（< 0.01%）时无效"""
-        exchange = MagicMock(spec=ExchangeAdapter)
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
 
         # 止损价 100.005 < 100 * 1.0001 = 100.01
         assert mgr.is_stop_price_valid(
             position_side=PositionSide.LONG,
             stop_price=Decimal("100.005"),
-            liquidation_price=Decimal("100"),
+            liquidation_price=D_100,
         ) is False
 
-    def test_short_valid_stop_price(self):
+    def test_short_valid_stop_price(self, mgr):
         """SHORT 止损价低于爆仓价时有效"""
-        exchange = MagicMock(spec=ExchangeAdapter)
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
 
         # 止损价 99 < 爆仓价 100 * 0.9999 = 99.99
         assert mgr.is_stop_price_valid(
             position_side=PositionSide.SHORT,
             stop_price=Decimal("99"),
-            liquidation_price=Decimal("100"),
+            liquidation_price=D_100,
         ) is True
 
-    def test_short_invalid_stop_price_above_liq(self):
+    def test_short_invalid_stop_price_above_liq(self, mgr):
         """SHORT 止损价高于爆仓价时无效"""
-        exchange = MagicMock(spec=ExchangeAdapter)
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
 
         # 止损价 101 > 爆仓价 100
         assert mgr.is_stop_price_valid(
             position_side=PositionSide.SHORT,
             stop_price=Decimal("101"),
-            liquidation_price=Decimal("100"),
+            liquidation_price=D_100,
         ) is False
 
-    def test_short_invalid_stop_price_too_close(self):
+    def test_short_invalid_stop_price_too_close(self, mgr):
         """SHORT 止损价接近爆仓价（< 0.01%）时无效"""
-        exchange = MagicMock(spec=ExchangeAdapter)
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
 
         # 止损价 99.995 > 100 * 0.9999 = 99.99
         assert mgr.is_stop_price_valid(
             position_side=PositionSide.SHORT,
             stop_price=Decimal("99.995"),
-            liquidation_price=Decimal("100"),
+            liquidation_price=D_100,
         ) is False
 
 
-@pytest.mark.asyncio
 class TestInvalidExternalStop:
     """无效外部止损场景测试"""
 
-    async def test_cancels_invalid_external_short_stop(self, monkeypatch):
+    async def test_cancels_invalid_external_short_stop(self, exchange, mgr, log_events):
         """SHORT 外部止损价高于爆仓价时，取消外部止损并由程序接管"""
-        events: list[dict] = []
-
-        def fake_log_event(*_args, **kwargs):
-            events.append(kwargs)
-
-        monkeypatch.setattr("src.risk.protective_stop.log_event", fake_log_event)
-
-        exchange = MagicMock(spec=ExchangeAdapter)
-        exchange.fetch_open_orders = AsyncMock(return_value=[])
-        exchange.fetch_open_orders_raw = AsyncMock(
-            return_value=[
-                {
-                    "id": "ext-invalid",
-                    "type": "stop_market",
-                    "reduceOnly": True,
-                    "triggerPrice": "110",  # 高于爆仓价 100，无效
-                    "info": {"positionSide": "SHORT", "reduceOnly": True, "triggerPrice": "110"},
-                }
-            ]
-        )
-        exchange.fetch_open_algo_orders = AsyncMock(return_value=[])
-        exchange.place_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="new-1", status=OrderStatus.NEW)
-        )
-        exchange.cancel_algo_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="ext-invalid", status=OrderStatus.CANCELED)
+        exchange.fetch_open_orders_raw.return_value = [
+            {
+                "id": "ext-invalid",
+                "type": "stop_market",
+                "reduceOnly": True,
+                "triggerPrice": "110",  # 高于爆仓价 100，无效
+                "info": {"positionSide": "SHORT", "reduceOnly": True, "triggerPrice": "110"},
+            }
+        ]
+        exchange.place_order.return_value = OrderResult(success=True, order_id="new-1", status=OrderStatus.NEW)
+        exchange.cancel_algo_order.return_value = OrderResult(
+            success=True, order_id="ext-invalid", status=OrderStatus.CANCELED
         )
 
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
         symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
+        rules = BTC_RULES
         positions = {
-            PositionSide.SHORT: Position(
-                symbol=symbol,
-                position_side=PositionSide.SHORT,
-                position_amt=Decimal("-0.01"),
-                entry_price=Decimal("90"),
-                unrealized_pnl=Decimal("0"),
-                leverage=10,
-                liquidation_price=Decimal("100"),  # 爆仓价
-                mark_price=Decimal("95"),
-            )
+            PositionSide.SHORT: replace(_BASE_SHORT, entry_price=Decimal("90"), mark_price=Decimal("95")),  # 爆仓价沿用 100
         }
 
         await mgr.sync_symbol(
@@ -1017,7 +605,7 @@ class TestInvalidExternalStop:
             rules=rules,
             positions=positions,
             enabled=True,
-            dist_to_liq=Decimal("0.01"),
+            dist_to_liq=D_0_01,
         )
 
         # 应该取消无效的外部止损
@@ -1025,65 +613,35 @@ class TestInvalidExternalStop:
         # 应该下新的有效止损单
         exchange.place_order.assert_called()
         # 应该有 cancel_invalid_external_stop 日志
-        assert any(e.get("reason") == "cancel_invalid_external_stop" for e in events)
+        assert any(e.get("reason") == "cancel_invalid_external_stop" for e in log_events)
 
-    async def test_valid_external_keeps_takeover(self, monkeypatch):
+    async def test_valid_external_keeps_takeover(self, exchange, mgr, log_events):
         """存在有效外部止损时保持外部接管（仅清理无效单）"""
-        events: list[dict] = []
-
-        def fake_log_event(*_args, **kwargs):
-            events.append(kwargs)
-
-        monkeypatch.setattr("src.risk.protective_stop.log_event", fake_log_event)
-
-        exchange = MagicMock(spec=ExchangeAdapter)
-        exchange.fetch_open_orders = AsyncMock(return_value=[])
-        exchange.fetch_open_orders_raw = AsyncMock(
-            return_value=[
-                {
-                    "id": "ext-invalid",
-                    "type": "stop_market",
-                    "reduceOnly": True,
-                    "triggerPrice": "110",
-                    "info": {"positionSide": "SHORT", "reduceOnly": True, "triggerPrice": "110"},
-                },
-                {
-                    "id": "ext-valid",
-                    "type": "stop_market",
-                    "reduceOnly": True,
-                    "triggerPrice": "90",
-                    "info": {"positionSide": "SHORT", "reduceOnly": True, "triggerPrice": "90"},
-                },
-            ]
-        )
-        exchange.fetch_open_algo_orders = AsyncMock(return_value=[])
-        exchange.place_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="new-1", status=OrderStatus.NEW)
-        )
-        exchange.cancel_algo_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="ext-invalid", status=OrderStatus.CANCELED)
+        exchange.fetch_open_orders_raw.return_value = [
+            {
+                "id": "ext-invalid",
+                "type": "stop_market",
+                "reduceOnly": True,
+                "triggerPrice": "110",
+                "info": {"positionSide": "SHORT", "reduceOnly": True, "triggerPrice": "110"},
+            },
+            {
+                "id": "ext-valid",
+                "type": "stop_market",
+                "reduceOnly": True,
+                "triggerPrice": "90",
+                "info": {"positionSide": "SHORT", "reduceOnly": True, "triggerPrice": "90"},
+            },
+        ]
+        exchange.place_order.return_value = OrderResult(success=True, order_id="new-1", status=OrderStatus.NEW)
+        exchange.cancel_algo_order.return_value = OrderResult(
+            success=True, order_id="ext-invalid", status=OrderStatus.CANCELED
         )
 
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
         symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
+        rules = BTC_RULES
         positions = {
-            PositionSide.SHORT: Position(
-                symbol=symbol,
-                position_side=PositionSide.SHORT,
-                position_amt=Decimal("-0.01"),
-                entry_price=Decimal("90"),
-                unrealized_pnl=Decimal("0"),
-                leverage=10,
-                liquidation_price=Decimal("100"),
-                mark_price=Decimal("95"),
-            )
+            PositionSide.SHORT: replace(_BASE_SHORT, entry_price=Decimal("90"), mark_price=Decimal("95")),
         }
 
         await mgr.sync_symbol(
@@ -1091,63 +649,33 @@ class TestInvalidExternalStop:
             rules=rules,
             positions=positions,
             enabled=True,
-            dist_to_liq=Decimal("0.01"),
+            dist_to_liq=D_0_01,
         )
 
         exchange.cancel_algo_order.assert_called()
         exchange.place_order.assert_not_called()
-        assert any(e.get("reason") == "cancel_invalid_external_stop" for e in events)
+        assert any(e.get("reason") == "cancel_invalid_external_stop" for e in log_events)
 
-    async def test_invalid_external_ignores_latch(self, monkeypatch):
+    async def test_invalid_external_ignores_latch(self, exchange, mgr, log_events):
         """无效外部止损在锁存期内也应允许接管"""
-        events: list[dict] = []
-
-        def fake_log_event(*_args, **kwargs):
-            events.append(kwargs)
-
-        monkeypatch.setattr("src.risk.protective_stop.log_event", fake_log_event)
-
-        exchange = MagicMock(spec=ExchangeAdapter)
-        exchange.fetch_open_orders = AsyncMock(return_value=[])
-        exchange.fetch_open_orders_raw = AsyncMock(
-            return_value=[
-                {
-                    "id": "ext-invalid",
-                    "type": "stop_market",
-                    "reduceOnly": True,
-                    "triggerPrice": "110",
-                    "info": {"positionSide": "SHORT", "reduceOnly": True, "triggerPrice": "110"},
-                }
-            ]
-        )
-        exchange.fetch_open_algo_orders = AsyncMock(return_value=[])
-        exchange.place_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="new-1", status=OrderStatus.NEW)
-        )
-        exchange.cancel_algo_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="ext-invalid", status=OrderStatus.CANCELED)
+        exchange.fetch_open_orders_raw.return_value = [
+            {
+                "id": "ext-invalid",
+                "type": "stop_market",
+                "reduceOnly": True,
+                "triggerPrice": "110",
+                "info": {"positionSide": "SHORT", "reduceOnly": True, "triggerPrice": "110"},
+            }
+        ]
+        exchange.place_order.return_value = OrderResult(success=True, order_id="new-1", status=OrderStatus.NEW)
+        exchange.cancel_algo_order.return_value = OrderResult(
+            success=True, order_id="ext-invalid", status=OrderStatus.CANCELED
         )
 
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
         symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
+        rules = BTC_RULES
         positions = {
-            PositionSide.SHORT: Position(
-                symbol=symbol,
-                position_side=PositionSide.SHORT,
-                position_amt=Decimal("-0.01"),
-                entry_price=Decimal("90"),
-                unrealized_pnl=Decimal("0"),
-                leverage=10,
-                liquidation_price=Decimal("100"),
-                mark_price=Decimal("95"),
-            )
+            PositionSide.SHORT: replace(_BASE_SHORT, entry_price=Decimal("90"), mark_price=Decimal("95")),
         }
 
         await mgr.sync_symbol(
@@ -1155,40 +683,30 @@ class TestInvalidExternalStop:
             rules=rules,
             positions=positions,
             enabled=True,
-            dist_to_liq=Decimal("0.01"),
+            dist_to_liq=D_0_01,
             external_stop_latch_by_side={PositionSide.SHORT: True},
         )
 
         exchange.cancel_algo_order.assert_called()
         exchange.place_order.assert_called()
-        assert any(e.get("reason") == "cancel_invalid_external_stop" for e in events)
+        assert any(e.get("reason") == "cancel_invalid_external_stop" for e in log_events)
 
 
-@pytest.mark.asyncio
 class TestProtectiveStopLiqWrongSide:
     """交叉保证金下爆仓价方向异常：跳过保护止损"""
 
-    async def test_short_liq_below_mark_skips(self):
+    async def test_short_liq_below_mark_skips(self, exchange, mgr):
         """SHORT 持仓但 liq < mark（对冲方向导致），应跳过而非尝试下单"""
-        exchange = MagicMock(spec=ExchangeAdapter)
-        exchange.fetch_open_orders = AsyncMock(return_value=[])
-        exchange.fetch_open_orders_raw = AsyncMock(return_value=[])
-        exchange.fetch_open_algo_orders = AsyncMock(return_value=[])
-        exchange.place_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
-        )
-        exchange.cancel_algo_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.CANCELED)
-        )
+        exchange.place_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
+        exchange.cancel_algo_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.CANCELED)
 
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
         symbol = "DASH/USDT:USDT"
         rules = SymbolRules(
             symbol=symbol,
-            tick_size=Decimal("0.001"),
-            step_size=Decimal("0.01"),
-            min_qty=Decimal("0.01"),
-            min_notional=Decimal("5"),
+            tick_size=D_0_001,
+            step_size=D_0_01,
+            min_qty=D_0_01,
+            min_notional=D_5,
         )
         # SHORT 持仓，但 liq_price(29.52) < mark_price(31.83)
         # 交叉保证金下 LONG 主导时会出现这种情况
@@ -1198,7 +716,7 @@ class TestProtectiveStopLiqWrongSide:
                 position_side=PositionSide.SHORT,
                 position_amt=Decimal("1.97"),
                 entry_price=Decimal("30.50"),
-                unrealized_pnl=Decimal("0"),
+                unrealized_pnl=D_0,
                 leverage=5,
                 liquidation_price=Decimal("29.52"),
                 mark_price=Decimal("31.83"),
@@ -1210,33 +728,24 @@ class TestProtectiveStopLiqWrongSide:
             rules=rules,
             positions=positions,
             enabled=True,
-            dist_to_liq=Decimal("0.01"),
+            dist_to_liq=D_0_01,
         )
 
         # 不应尝试下单
         exchange.place_order.assert_not_called()
 
-    async def test_long_liq_above_mark_skips(self):
+    async def test_long_liq_above_mark_skips(self, exchange, mgr):
         """LONG 持仓但 liq > mark（对冲方向导致），应跳过"""
-        exchange = MagicMock(spec=ExchangeAdapter)
-        exchange.fetch_open_orders = AsyncMock(return_value=[])
-        exchange.fetch_open_orders_raw = AsyncMock(return_value=[])
-        exchange.fetch_open_algo_orders = AsyncMock(return_value=[])
-        exchange.place_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
-        )
-        exchange.cancel_algo_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.CANCELED)
-        )
+        exchange.place_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
+        exchange.cancel_algo_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.CANCELED)
 
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
         symbol = "DASH/USDT:USDT"
         rules = SymbolRules(
             symbol=symbol,
-            tick_size=Decimal("0.001"),
-            step_size=Decimal("0.01"),
-            min_qty=Decimal("0.01"),
-            min_notional=Decimal("5"),
+            tick_size=D_0_001,
+            step_size=D_0_01,
+            min_qty=D_0_01,
+            min_notional=D_5,
         )
         # LONG 持仓，但 liq_price(35.00) > mark_price(31.83)
         # 交叉保证金下 SHORT 主导时的对称情况
@@ -1246,7 +755,7 @@ class TestProtectiveStopLiqWrongSide:
                 position_side=PositionSide.LONG,
                 position_amt=Decimal("1.97"),
                 entry_price=Decimal("30.50"),
-                unrealized_pnl=Decimal("0"),
+                unrealized_pnl=D_0,
                 leverage=5,
                 liquidation_price=Decimal("35.00"),
                 mark_price=Decimal("31.83"),
@@ -1258,43 +767,28 @@ class TestProtectiveStopLiqWrongSide:
             rules=rules,
             positions=positions,
             enabled=True,
-            dist_to_liq=Decimal("0.01"),
+            dist_to_liq=D_0_01,
         )
 
         exchange.place_order.assert_not_called()
 
-    async def test_short_liq_above_mark_proceeds(self):
+    async def test_short_liq_above_mark_proceeds(self, exchange, mgr):
         """SHORT 持仓且 liq > mark（正常），应正常下单"""
-        exchange = MagicMock(spec=ExchangeAdapter)
-        exchange.fetch_open_orders = AsyncMock(return_value=[])
-        exchange.fetch_open_orders_raw = AsyncMock(return_value=[])
-        exchange.fetch_open_algo_orders = AsyncMock(return_value=[])
-        exchange.place_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
-        )
-        exchange.cancel_algo_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.CANCELED)
-        )
+        exchange.place_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
+        exchange.cancel_algo_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.CANCELED)
 
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
         symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
+        rules = BTC_RULES
         # SHORT 持仓，liq_price(100) > mark_price(95) — 正常情况
         positions = {
             PositionSide.SHORT: Position(
                 symbol=symbol,
                 position_side=PositionSide.SHORT,
-                position_amt=Decimal("0.01"),
+                position_amt=D_0_01,
                 entry_price=Decimal("90"),
-                unrealized_pnl=Decimal("0"),
+                unrealized_pnl=D_0,
                 leverage=10,
-                liquidation_price=Decimal("100"),
+                liquidation_price=D_100,
                 mark_price=Decimal("95"),
             )
         }
@@ -1304,43 +798,28 @@ class TestProtectiveStopLiqWrongSide:
             rules=rules,
             positions=positions,
             enabled=True,
-            dist_to_liq=Decimal("0.01"),
+            dist_to_liq=D_0_01,
         )
 
         exchange.place_order.assert_called_once()
 
-    async def test_no_mark_price_still_attempts(self):
+    async def test_no_mark_price_still_attempts(self, exchange, mgr):
         """mark_price 为 None 时不做方向检查，仍尝试下单"""
-        exchange = MagicMock(spec=ExchangeAdapter)
-        exchange.fetch_open_orders = AsyncMock(return_value=[])
-        exchange.fetch_open_orders_raw = AsyncMock(return_value=[])
-        exchange.fetch_open_algo_orders = AsyncMock(return_value=[])
-        exchange.place_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
-        )
-        exchange.cancel_algo_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.CANCELED)
-        )
+        exchange.place_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
+        exchange.cancel_algo_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.CANCELED)
 
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
         symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
+        rules = BTC_RULES
         # mark_price = None，无法判断方向，应正常尝试
         positions = {
             PositionSide.SHORT: Position(
                 symbol=symbol,
                 position_side=PositionSide.SHORT,
-                position_amt=Decimal("0.01"),
+                position_amt=D_0_01,
                 entry_price=Decimal("90"),
-                unrealized_pnl=Decimal("0"),
+                unrealized_pnl=D_0,
                 leverage=10,
-                liquidation_price=Decimal("100"),
+                liquidation_price=D_100,
                 mark_price=None,
             )
         }
@@ -1350,39 +829,23 @@ class TestProtectiveStopLiqWrongSide:
             rules=rules,
             positions=positions,
             enabled=True,
-            dist_to_liq=Decimal("0.01"),
+            dist_to_liq=D_0_01,
         )
 
         exchange.place_order.assert_called_once()
 
-    async def test_wrong_side_log_dedup(self, monkeypatch):
+    async def test_wrong_side_log_dedup(self, exchange, mgr, log_events):
         """同一 symbol+side 方向异常连续 sync 两次，只记录一次 skip_liq_wrong_side"""
-        events: list[dict] = []
-
-        def fake_log_event(*_args, **kwargs):
-            events.append(kwargs)
-
-        monkeypatch.setattr("src.risk.protective_stop.log_event", fake_log_event)
-
-        exchange = MagicMock(spec=ExchangeAdapter)
-        exchange.fetch_open_orders = AsyncMock(return_value=[])
-        exchange.fetch_open_orders_raw = AsyncMock(return_value=[])
-        exchange.fetch_open_algo_orders = AsyncMock(return_value=[])
-        exchange.place_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
-        )
-        exchange.cancel_algo_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.CANCELED)
-        )
+        exchange.place_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
+        exchange.cancel_algo_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.CANCELED)
 
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
         symbol = "DASH/USDT:USDT"
         rules = SymbolRules(
             symbol=symbol,
-            tick_size=Decimal("0.001"),
-            step_size=Decimal("0.01"),
-            min_qty=Decimal("0.01"),
-            min_notional=Decimal("5"),
+            tick_size=D_0_001,
+            step_size=D_0_01,
+            min_qty=D_0_01,
+            min_notional=D_5,
         )
         positions = {
             PositionSide.SHORT: Position(
@@ -1390,7 +853,7 @@ class TestProtectiveStopLiqWrongSide:
                 position_side=PositionSide.SHORT,
                 position_amt=Decimal("1.97"),
                 entry_price=Decimal("30.50"),
-                unrealized_pnl=Decimal("0"),
+                unrealized_pnl=D_0,
                 leverage=5,
                 liquidation_price=Decimal("29.52"),
                 mark_price=Decimal("31.83"),
@@ -1400,15 +863,15 @@ class TestProtectiveStopLiqWrongSide:
         # 第一次 sync
         await mgr.sync_symbol(
             symbol=symbol, rules=rules, positions=positions,
-            enabled=True, dist_to_liq=Decimal("0.01"),
+            enabled=True, dist_to_liq=D_0_01,
         )
         # 第二次 sync（方向仍异常）
         await mgr.sync_symbol(
             symbol=symbol, rules=rules, positions=positions,
-            enabled=True, dist_to_liq=Decimal("0.01"),
+            enabled=True, dist_to_liq=D_0_01,
         )
 
-        wrong_side_events = [e for e in events if e.get("reason") == "skip_liq_wrong_side"]
+        wrong_side_events = [e for e in log_events if e.get("reason") == "skip_liq_wrong_side"]
         assert len(wrong_side_events) == 1  # 只记录一次
         exchange.place_order.assert_not_called()
 
@@ -1416,365 +879,143 @@ class TestProtectiveStopLiqWrongSide:
 class TestProtectiveStopAdoptionLog:
     """adoption 路径条件日志: 仅在本地状态缺失时打印 info 日志"""
 
-    @pytest.mark.asyncio
-    async def test_adopt_existing_logs_when_no_local_state(self, monkeypatch):
+    async def test_adopt_existing_logs_when_no_local_state(self, exchange, mgr, log_events):
         """本地无状态时发现既有订单(价格一致), 应打 adopt_existing 日志"""
-        events: list[dict] = []
-
-        def fake_log_event(*_args, **kwargs):
-            events.append(kwargs)
-
-        monkeypatch.setattr("src.risk.protective_stop.log_event", fake_log_event)
+        exchange.fetch_open_algo_orders.return_value = [_ALGO_LONG | {"clientAlgoId": "vq-ps-btcusdt-L-12345"}]
+        exchange.place_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
+        exchange.cancel_algo_order.return_value = OrderResult(success=True, order_id="999", status=OrderStatus.CANCELED)
 
-        exchange = MagicMock(spec=ExchangeAdapter)
-        exchange.fetch_open_orders = AsyncMock(return_value=[])
-        exchange.fetch_open_orders_raw = AsyncMock(return_value=[])
-        exchange.fetch_open_algo_orders = AsyncMock(
-            return_value=[
-                {
-                    "algoId": "999",
-                    "clientAlgoId": "vq-ps-btcusdt-L-12345",
-                    "orderType": "STOP_MARKET",
-                    "positionSide": "LONG",
-                    "closePosition": True,
-                    "triggerPrice": "101.1",
-                }
-            ]
-        )
-        exchange.place_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
-        )
-        exchange.cancel_algo_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="999", status=OrderStatus.CANCELED)
-        )
-
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
         symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
-        positions = {
-            PositionSide.LONG: Position(
-                symbol=symbol,
-                position_side=PositionSide.LONG,
-                position_amt=Decimal("0.01"),
-                entry_price=Decimal("100"),
-                unrealized_pnl=Decimal("0"),
-                leverage=10,
-                liquidation_price=Decimal("100"),
-                mark_price=Decimal("110"),
-            )
-        }
+        rules = BTC_RULES
+        positions = LONG_POS
 
         # _states 为空(无本地状态), 发现既有订单价格一致 -> 应打日志
         await mgr.sync_symbol(
             symbol=symbol, rules=rules, positions=positions,
-            enabled=True, dist_to_liq=Decimal("0.01"),
+            enabled=True, dist_to_liq=D_0_01,
         )
 
-        adopt_events = [e for e in events if e.get("reason") == "adopt_existing"]
+        adopt_events = [e for e in log_events if e.get("reason") == "adopt_existing"]
         assert len(adopt_events) == 1
         assert adopt_events[0]["order_id"] == "999"
         exchange.place_order.assert_not_called()
 
-    @pytest.mark.asyncio
-    async def test_adopt_existing_silent_when_local_state_exists(self, monkeypatch):
+    async def test_adopt_existing_silent_when_local_state_exists(self, exchange, mgr, log_events):
         """本地已有状态时, adopt_existing 不打日志(避免刷屏)"""
-        events: list[dict] = []
-
-        def fake_log_event(*_args, **kwargs):
-            events.append(kwargs)
-
-        monkeypatch.setattr("src.risk.protective_stop.log_event", fake_log_event)
-
-        exchange = MagicMock(spec=ExchangeAdapter)
-        exchange.fetch_open_orders = AsyncMock(return_value=[])
-        exchange.fetch_open_orders_raw = AsyncMock(return_value=[])
-        exchange.fetch_open_algo_orders = AsyncMock(
-            return_value=[
-                {
-                    "algoId": "999",
-                    "clientAlgoId": "vq-ps-btcusdt-L-12345",
-                    "orderType": "STOP_MARKET",
-                    "positionSide": "LONG",
-                    "closePosition": True,
-                    "triggerPrice": "101.1",
-                }
-            ]
-        )
-        exchange.place_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
-        )
-        exchange.cancel_algo_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="999", status=OrderStatus.CANCELED)
-        )
+        exchange.fetch_open_algo_orders.return_value = [_ALGO_LONG | {"clientAlgoId": "vq-ps-btcusdt-L-12345"}]
+        exchange.place_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
+        exchange.cancel_algo_order.return_value = OrderResult(success=True, order_id="999", status=OrderStatus.CANCELED)
 
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
         symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
-        positions = {
-            PositionSide.LONG: Position(
-                symbol=symbol,
-                position_side=PositionSide.LONG,
-                position_amt=Decimal("0.01"),
-                entry_price=Decimal("100"),
-                unrealized_pnl=Decimal("0"),
-                leverage=10,
-                liquidation_price=Decimal("100"),
-                mark_price=Decimal("110"),
-            )
-        }
+        rules = BTC_RULES
+        positions = LONG_POS
 
         # 第一次 sync: 无本地状态, 会打 adopt_existing
         await mgr.sync_symbol(
             symbol=symbol, rules=rules, positions=positions,
-            enabled=True, dist_to_liq=Decimal("0.01"),
+            enabled=True, dist_to_liq=D_0_01,
         )
-        events.clear()
+        log_events.clear()
 
         # 第二次 sync: 本地已有状态, 不应再打 adopt_existing
         await mgr.sync_symbol(
             symbol=symbol, rules=rules, positions=positions,
-            enabled=True, dist_to_liq=Decimal("0.01"),
+            enabled=True, dist_to_liq=D_0_01,
         )
 
-        adopt_events = [e for e in events if e.get("reason") == "adopt_existing"]
+        adopt_events = [e for e in log_events if e.get("reason") == "adopt_existing"]
         assert len(adopt_events) == 0
 
-    @pytest.mark.asyncio
-    async def test_keep_tighter_logs_when_no_local_state(self, monkeypatch):
+    async def test_keep_tighter_logs_when_no_local_state(self, exchange, mgr, log_events):
         """本地无状态时发现更紧的既有订单(拒绝放松), 应打 keep_existing_tighter 日志"""
-        events: list[dict] = []
-
-        def fake_log_event(*_args, **kwargs):
-            events.append(kwargs)
-
-        monkeypatch.setattr("src.risk.protective_stop.log_event", fake_log_event)
-
-        exchange = MagicMock(spec=ExchangeAdapter)
-        exchange.fetch_open_orders = AsyncMock(return_value=[])
-        exchange.fetch_open_orders_raw = AsyncMock(return_value=[])
-        exchange.fetch_open_algo_orders = AsyncMock(
-            return_value=[
-                {
-                    "algoId": "999",
-                    "clientAlgoId": "vq-ps-btcusdt-L-12345",
-                    "orderType": "STOP_MARKET",
-                    "positionSide": "LONG",
-                    "closePosition": True,
-                    "triggerPrice": "101.1",
-                }
-            ]
-        )
-        exchange.place_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
-        )
-        exchange.cancel_algo_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="999", status=OrderStatus.CANCELED)
-        )
+        exchange.fetch_open_algo_orders.return_value = [_ALGO_LONG | {"clientAlgoId": "vq-ps-btcusdt-L-12345"}]
+        exchange.place_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
+        exchange.cancel_algo_order.return_value = OrderResult(success=True, order_id="999", status=OrderStatus.CANCELED)
 
-        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
         symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
-        positions = {
-            PositionSide.LONG: Position(
-                symbol=symbol,
-                position_side=PositionSide.LONG,
-                position_amt=Decimal("0.01"),
-                entry_price=Decimal("100"),
-                unrealized_pnl=Decimal("0"),
-                leverage=10,
-                liquidation_price=Decimal("100"),
-                mark_price=Decimal("110"),
-            )
-        }
+        rules = BTC_RULES
+        positions = LONG_POS
 
         # dist_to_liq=0.005 -> desired_stop 更低(更松), 但既有 101.1(更紧) -> keep_existing_tighter
         await mgr.sync_symbol(
             symbol=symbol, rules=rules, positions=positions,
-            enabled=True, dist_to_liq=Decimal("0.005"),
+            enabled=True, dist_to_liq=D_0_005,
         )
 
-        keep_events = [e for e in events if e.get("reason") == "keep_existing_tighter"]
+        keep_events = [e for e in log_events if e.get("reason") == "keep_existing_tighter"]
         assert len(keep_events) == 1
         assert keep_events[0]["order_id"] == "999"
-        exchange.place_order.assert_not_called()
-        exchange.cancel_algo_order.assert_not_called()
+        _assert_no_order_mutations(exchange)
 
-    @pytest.mark.asyncio
-    async def test_sync_allows_loosen_when_liq_improves_enough(self):
+    async def test_sync_allows_loosen_when_liq_improves_enough(self, exchange):
         """C: 爆仓价改善超过阈值时，允许放松保护止损（撤旧建新）。"""
-        exchange = MagicMock(spec=ExchangeAdapter)
-        exchange.fetch_open_orders = AsyncMock(return_value=[])
-        exchange.fetch_open_orders_raw = AsyncMock(return_value=[])
-        exchange.fetch_open_algo_orders = AsyncMock(
-            side_effect=[
-                [],  # 第一次：无既有单，直接下单
-                [    # 第二次：存在既有单（更紧）
-                    {
-                        "algoId": "1",
-                        "clientAlgoId": "vq-ps-btcusdt-L-12345",
-                        "orderType": "STOP_MARKET",
-                        "positionSide": "LONG",
-                        "closePosition": True,
-                        "triggerPrice": "101.1",
-                    }
-                ],
-            ]
-        )
-        exchange.place_order = AsyncMock(
-            side_effect=[
-                OrderResult(success=True, order_id="1", status=OrderStatus.NEW),
-                OrderResult(success=True, order_id="2", status=OrderStatus.NEW),
-            ]
-        )
-        exchange.cancel_algo_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.CANCELED)
-        )
+        exchange.fetch_open_algo_orders.side_effect = [
+            [],  # 第一次：无既有单，直接下单
+            # 第二次：存在既有单（更紧）
+            [_ALGO_LONG | {"algoId": "1", "clientAlgoId": "vq-ps-btcusdt-L-12345"}],
+        ]
+        exchange.place_order.side_effect = [
+            OrderResult(success=True, order_id="1", status=OrderStatus.NEW),
+            OrderResult(success=True, order_id="2", status=OrderStatus.NEW),
+        ]
+        exchange.cancel_algo_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.CANCELED)
 
         mgr = ProtectiveStopManager(
             exchange,
             client_order_id_prefix="vq-ps-",
             allow_loosen_on_liq_improve=True,
-            liq_improve_threshold=Decimal("0.005"),
+            liq_improve_threshold=D_0_005,
             loosen_cooldown_s=0,
         )
         symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
-        positions_v1 = {
-            PositionSide.LONG: Position(
-                symbol=symbol,
-                position_side=PositionSide.LONG,
-                position_amt=Decimal("0.01"),
-                entry_price=Decimal("100"),
-                unrealized_pnl=Decimal("0"),
-                leverage=10,
-                liquidation_price=Decimal("100"),
-                mark_price=Decimal("110"),
-            )
-        }
+        rules = BTC_RULES
+        positions_v1 = LONG_POS
         positions_v2 = {
-            PositionSide.LONG: Position(
-                symbol=symbol,
-                position_side=PositionSide.LONG,
-                position_amt=Decimal("0.01"),
-                entry_price=Decimal("100"),
-                unrealized_pnl=Decimal("0"),
-                leverage=10,
-                liquidation_price=Decimal("98"),
-                mark_price=Decimal("110"),
-            )
+            PositionSide.LONG: replace(_BASE_LONG, liquidation_price=Decimal("98")),
         }
 
         await mgr.sync_symbol(
             symbol=symbol, rules=rules, positions=positions_v1,
-            enabled=True, dist_to_liq=Decimal("0.01"),
+            enabled=True, dist_to_liq=D_0_01,
         )
         await mgr.sync_symbol(
             symbol=symbol, rules=rules, positions=positions_v2,
-            enabled=True, dist_to_liq=Decimal("0.01"),
+            enabled=True, dist_to_liq=D_0_01,
         )
 
         exchange.cancel_algo_order.assert_called_once_with(symbol, "1")
         assert exchange.place_order.await_count == 2
 
-    @pytest.mark.asyncio
-    async def test_sync_keeps_tighter_when_liq_improve_below_threshold(self):
+    async def test_sync_keeps_tighter_when_liq_improve_below_threshold(self, exchange):
         """C: 爆仓价改善不足阈值时，仍保持只收紧策略。"""
-        exchange = MagicMock(spec=ExchangeAdapter)
-        exchange.fetch_open_orders = AsyncMock(return_value=[])
-        exchange.fetch_open_orders_raw = AsyncMock(return_value=[])
-        exchange.fetch_open_algo_orders = AsyncMock(
-            side_effect=[
-                [],
-                [
-                    {
-                        "algoId": "1",
-                        "clientAlgoId": "vq-ps-btcusdt-L-12345",
-                        "orderType": "STOP_MARKET",
-                        "positionSide": "LONG",
-                        "closePosition": True,
-                        "triggerPrice": "101.1",
-                    }
-                ],
-            ]
-        )
-        exchange.place_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
-        )
-        exchange.cancel_algo_order = AsyncMock(
-            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.CANCELED)
-        )
+        exchange.fetch_open_algo_orders.side_effect = [
+            [],
+            [_ALGO_LONG | {"algoId": "1", "clientAlgoId": "vq-ps-btcusdt-L-12345"}],
+        ]
+        exchange.place_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
+        exchange.cancel_algo_order.return_value = OrderResult(success=True, order_id="1", status=OrderStatus.CANCELED)
 
         mgr = ProtectiveStopManager(
             exchange,
             client_order_id_prefix="vq-ps-",
-            liq_improve_threshold=Decimal("0.005"),
+            liq_improve_threshold=D_0_005,
             loosen_cooldown_s=0,
         )
         symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
-        positions_v1 = {
-            PositionSide.LONG: Position(
-                symbol=symbol,
-                position_side=PositionSide.LONG,
-                position_amt=Decimal("0.01"),
-                entry_price=Decimal("100"),
-                unrealized_pnl=Decimal("0"),
-                leverage=10,
-                liquidation_price=Decimal("100"),
-                mark_price=Decimal("110"),
-            )
-        }
+        rules = BTC_RULES
+        positions_v1 = LONG_POS
         # 100 -> 99.7 仅改善 0.3%，低于 0.5% 阈值
         positions_v2 = {
-            PositionSide.LONG: Position(
-                symbol=symbol,
-                position_side=PositionSide.LONG,
-                position_amt=Decimal("0.01"),
-                entry_price=Decimal("100"),
-                unrealized_pnl=Decimal("0"),
-                leverage=10,
-                liquidation_price=Decimal("99.7"),
-                mark_price=Decimal("110"),
-            )
+            PositionSide.LONG: replace(_BASE_LONG, liquidation_price=Decimal("99.7")),
         }
 
         await mgr.sync_symbol(
             symbol=symbol, rules=rules, positions=positions_v1,
-            enabled=True, dist_to_liq=Decimal("0.01"),
+            enabled=True, dist_to_liq=D_0_01,
         )
         await mgr.sync_symbol(
             symbol=symbol, rules=rules, positions=positions_v2,
-            enabled=True, dist_to_liq=Decimal("0.01"),
+            enabled=True, dist_to_liq=D_0_01,
         )
 
         exchange.cancel_algo_order.assert_not_called()
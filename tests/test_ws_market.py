@@ -9,7 +9,7 @@
 
 import pytest
 from decimal import Decimal
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 from tempfile import TemporaryDirectory
 from pathlib import Path
 from typing import List
@@ -446,7 +446,7 @@ class TestReconnectCallback:
     """重连成功回调测试"""
 
     @pytest.mark.asyncio
-    async def test_on_reconnect_called_after_reconnect(self):
+    async def test_on_reconnect_called_after_reconnect(self, monkeypatch):
         events: List[MarketEvent] = []
         called: List[str] = []
 
@@ -456,23 +456,36 @@ class TestReconnectCallback:
             on_reconnect=called.append,
         )
 
-        # 模拟已发生过重连尝试
-        client._reconnect_count = 1
-
-        dummy_ws = MagicMock()
-        dummy_ws.close = AsyncMock()
-        dummy_ws.closed = False
+        first_ws = MagicMock()
+        first_ws.close = AsyncMock()
+        first_ws.closed = False
+        second_ws = MagicMock()
+        second_ws.close = AsyncMock()
+        second_ws.closed = False
         dummy_session = MagicMock()
         dummy_session.closed = False
-        dummy_session.ws_connect = AsyncMock(return_value=dummy_ws)
+        dummy_session.ws_connect = AsyncMock(side_effect=[first_ws, second_ws])
         dummy_session.close = AsyncMock()
 
-        with patch("src.ws.market.aiohttp.ClientSession", return_value=dummy_session):
-            with patch.object(client, "_receive_loop", new=AsyncMock()):
-                await client.connect()
-                await client.disconnect()
+        session_cls = MagicMock(return_value=dummy_session)
+        monkeypatch.setattr("src.ws.market.aiohttp.ClientSession", session_cls)
+        # 客户端带 __slots__，实例方法只读：在类上替换 _receive_loop
+        monkeypatch.setattr(MarketWSClient, "_receive_loop", AsyncMock())
+
+        await client.connect()
+        assert called == []
+
+        # 模拟断线后的重连尝试
+        first_ws.closed = True
+        client._reconnect_count = 1
+        await client.connect()
+        await client.disconnect()
 
         assert called == ["market_data"]
+        # 重连复用同一会话，只重开 ws
+        assert session_cls.call_count == 1
+        assert dummy_session.ws_connect.await_count == 2
+        dummy_session.close.assert_awaited_once()
 
 
 class TestConnectionState:
@@ -492,8 +505,7 @@ class TestConnectionState:
 class TestHandleMessage:
     """消息处理测试"""
 
-    @pytest.mark.asyncio
-    async def test_handle_message_book_ticker(self):
+    def test_handle_message_book_ticker(self):
         """测试处理 bookTicker 消息"""
         events: List[MarketEvent] = []
         client = MarketWSClient(
@@ -515,14 +527,13 @@ class TestHandleMessage:
             }
         }
 
-        await client._handle_message(message)
+        client._handle_message(message)
 
         assert len(events) == 1
         assert events[0].event_type == "book_ticker"
         assert events[0].best_bid == Decimal("50000.10")
 
-    @pytest.mark.asyncio
-    async def test_handle_message_agg_trade(self):
+    def test_handle_message_agg_trade(self):
         """测试处理 aggTrade 消息"""
         events: List[MarketEvent] = []
         client = MarketWSClient(
@@ -544,7 +555,7 @@ class TestHandleMessage:
             }
         }
 
-        await client._handle_message(message)
+        client._handle_message(message)
 
         assert len(events) == 1
         assert events[0].event_type == "agg_trade"
@@ -552,8 +563,7 @@ class TestHandleMessage:
         assert events[0].trade_qty == Decimal("0.001")
         assert events[0].is_buyer_maker is True
 
-    @pytest.mark.asyncio
-    async def test_handle_message_unknown_stream(self):
+    def test_handle_message_unknown_stream(self):
         """测试处理未知流类型"""
         events: List[MarketEvent] = []
         client = MarketWSClient(
@@ -566,12 +576,11 @@ class TestHandleMessage:
             "data": {}
         }
 
-        await client._handle_message(message)
+        client._handle_message(message)
 
         assert len(events) == 0
 
-    @pytest.mark.asyncio
-    async def test_handle_message_mark_price(self):
+    def test_handle_message_mark_price(self):
         """测试处理 markPrice 消息"""
         events: List[MarketEvent] = []
         client = MarketWSClient(
@@ -589,14 +598,13 @@ class TestHandleMessage:
             }
         }
 
-        await client._handle_message(message)
+        client._handle_message(message)
 
         assert len(events) == 1
         assert events[0].event_type == "mark_price"
         assert events[0].mark_price == Decimal("50000.25")
 
-    @pytest.mark.asyncio
-    async def test_handle_message_depth_does_not_refresh_stale_timer(self):
+    def test_handle_message_depth_does_not_refresh_stale_timer(self):
         """测试 depth 数据不会刷新全局 stale 计时。"""
         events: List[MarketEvent] = []
         client = MarketWSClient(
@@ -616,14 +624,13 @@ class TestHandleMessage:
             }
         }
 
-        await client._handle_message(message)
+        client._handle_message(message)
 
         assert len(events) == 1
         assert events[0].event_type == "depth"
         assert client._last_update_ms["BTC/USDT:USDT"] == 1234567890
 
-    @pytest.mark.asyncio
-    async def test_handle_message_empty_data(self):
+    def test_handle_message_empty_data(self):
         """测试处理空数据"""
         events: List[MarketEvent] = []
         client = MarketWSClient(
@@ -636,6 +643,6 @@ class TestHandleMessage:
             "data": {}
         }
 
-        await client._handle_message(message)
+        client._handle_message(message)
 
         assert len(events) == 0
@@ -11,10 +11,10 @@ import asyncio
 import aiohttp
 import pytest
 from decimal import Decimal
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 from tempfile import TemporaryDirectory
 from pathlib import Path
-from typing import List
+from typing import Any, List, Optional, cast
 
 from src.ws.user_data import (
     UserDataWSClient,
@@ -37,14 +37,58 @@ from src.models import (
 from src.utils.logger import setup_logger
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture(scope="module", autouse=True)
 def setup_logger_for_tests():
-    """每个测试前设置 logger"""
+    """本模块设置一次 logger（setup_logger 会先移除旧 sink，其他模块各自重设不受影响）"""
     with TemporaryDirectory() as tmpdir:
         setup_logger(Path(tmpdir), console=False)
         yield
 
 
+class _FakeWS:
+    """最小 WS 替身：只记录是否被关闭"""
+
+    closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _FakeSession:
+    """最小 ClientSession 替身：ws_connect 返回 _FakeWS，并保留最近一次连接"""
+
+    closed = False
+
+    def __init__(self) -> None:
+        self.ws: Optional[_FakeWS] = None
+
+    async def ws_connect(self, *args: Any, **kwargs: Any) -> _FakeWS:
+        self.ws = _FakeWS()
+        return self.ws
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def _mkclient(**extra: Any) -> tuple[UserDataWSClient, List[OrderUpdate]]:
+    """构造测试客户端；未指定 on_order_update 时订单更新收集到返回的列表"""
+    updates: List[OrderUpdate] = []
+    extra.setdefault("on_order_update", updates.append)
+    return UserDataWSClient(api_key="key", api_secret="secret", **extra), updates
+
+
+@pytest.fixture
+def client() -> UserDataWSClient:
+    """默认参数的主网客户端（每个测试新建，回调丢弃）"""
+    return _mkclient()[0]
+
+
+@pytest.fixture
+def client_testnet() -> UserDataWSClient:
+    """默认参数的测试网客户端"""
+    return _mkclient(testnet=True)[0]
+
+
 class TestUserDataWSClientInit:
     """初始化测试"""
 
@@ -99,103 +143,52 @@ class TestUserDataWSClientInit:
 class TestURLs:
     """URL 测试"""
 
-    def test_rest_url_mainnet(self):
+    def test_rest_url_mainnet(self, client):
         """测试主网 REST URL"""
-        updates: List[OrderUpdate] = []
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=updates.append,
-            testnet=False,
-        )
-
         assert client._get_rest_url() == REST_BASE_URL
 
-    def test_rest_url_testnet(self):
+    def test_rest_url_testnet(self, client_testnet):
         """测试测试网 REST URL"""
-        updates: List[OrderUpdate] = []
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=updates.append,
-            testnet=True,
-        )
-
-        assert client._get_rest_url() == REST_TESTNET_URL
+        assert client_testnet._get_rest_url() == REST_TESTNET_URL
 
-    def test_ws_url_mainnet(self):
+    def test_ws_url_mainnet(self, client):
         """测试主网 WS URL"""
-        updates: List[OrderUpdate] = []
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=updates.append,
-            testnet=False,
-        )
-
         assert client._get_ws_url() == WS_BASE_URL
 
 
 class TestReconnectCallback:
     """重连成功回调测试"""
 
-    @pytest.mark.asyncio
     async def test_on_reconnect_called_after_reconnect(self):
-        updates: List[OrderUpdate] = []
         called: List[str] = []
+        session = _FakeSession()
 
-        client = UserDataWSClient(
-            api_key="test_key",
-            api_secret="test_secret",
-            on_order_update=updates.append,
-            on_reconnect=called.append,
-        )
+        client, _ = _mkclient(on_reconnect=called.append, session=cast(Any, session))
 
         client._reconnect_count = 1
+        client._get_listen_key = AsyncMock(return_value="listen_key")
+        client._close_listen_key = AsyncMock()
+        client._keepalive_loop = AsyncMock()
+        client._receive_loop = AsyncMock()
 
-        dummy_ws = MagicMock()
-        dummy_ws.close = AsyncMock()
-        dummy_ws.closed = False
-        dummy_session = MagicMock()
-        dummy_session.closed = False
-        dummy_session.ws_connect = AsyncMock(return_value=dummy_ws)
-        dummy_session.close = AsyncMock()
-
-        with patch.object(client, "_get_listen_key", new=AsyncMock(return_value="listen_key")):
-            with patch.object(client, "_close_listen_key", new=AsyncMock()):
-                with patch.object(client, "_keepalive_loop", new=AsyncMock()):
-                    with patch.object(client, "_receive_loop", new=AsyncMock()):
-                        with patch("src.ws.user_data.aiohttp.ClientSession", return_value=dummy_session):
-                            await client.connect()
-                            await asyncio.wait_for(client.disconnect(), timeout=3.0)
+        await client.connect()
+        await asyncio.wait_for(client.disconnect(), timeout=3.0)
 
         assert called == ["user_data"]
+        assert session.ws is not None and session.ws.closed is True
+        # 外部注入的 session 由调用方管理
+        assert session.closed is False
 
-    def test_ws_url_testnet(self):
+    def test_ws_url_testnet(self, client_testnet):
         """测试测试网 WS URL"""
-        updates: List[OrderUpdate] = []
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=updates.append,
-            testnet=True,
-        )
-
-        assert client._get_ws_url() == WS_TESTNET_URL
+        assert client_testnet._get_ws_url() == WS_TESTNET_URL
 
 
 class TestParseOrderUpdate:
     """ORDER_TRADE_UPDATE 解析测试"""
 
-    def test_parse_order_update_new(self):
+    def test_parse_order_update_new(self, client):
         """测试解析 NEW 订单"""
-        updates: List[OrderUpdate] = []
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=updates.append,
-        )
-
         data = {
             "e": "ORDER_TRADE_UPDATE",
             "E": 1591097736594,
@@ -233,15 +226,8 @@ class TestParseOrderUpdate:
         assert result.is_maker is None
         assert result.realized_pnl is None
 
-    def test_parse_order_update_filled(self):
+    def test_parse_order_update_filled(self, client):
         """测试解析 FILLED 订单"""
-        updates: List[OrderUpdate] = []
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=updates.append,
-        )
-
         data = {
             "e": "ORDER_TRADE_UPDATE",
             "E": 1591097736594,
@@ -279,15 +265,8 @@ class TestParseOrderUpdate:
         assert result.fee == Decimal("0.0001")
         assert result.fee_asset == "USDT"
 
-    def test_parse_order_update_partially_filled(self):
+    def test_parse_order_update_partially_filled(self, client):
         """测试解析部分成交订单"""
-        updates: List[OrderUpdate] = []
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=updates.append,
-        )
-
         data = {
             "e": "ORDER_TRADE_UPDATE",
             "E": 1591097736594,
@@ -315,15 +294,8 @@ class TestParseOrderUpdate:
         assert result.is_maker is None
         assert result.realized_pnl is None
 
-    def test_parse_order_update_canceled(self):
+    def test_parse_order_update_canceled(self, client):
         """测试解析取消订单"""
-        updates: List[OrderUpdate] = []
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=updates.append,
-        )
-
         data = {
             "e": "ORDER_TRADE_UPDATE",
             "E": 1591097736594,
@@ -344,15 +316,8 @@ class TestParseOrderUpdate:
         assert result is not None
         assert result.status == OrderStatus.CANCELED
 
-    def test_parse_order_update_close_position(self):
+    def test_parse_order_update_close_position(self, client):
         """测试解析 closePosition 字段（cp）"""
-        updates: List[OrderUpdate] = []
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=updates.append,
-        )
-
         data = {
             "e": "ORDER_TRADE_UPDATE",
             "E": 1591097736594,
@@ -378,18 +343,70 @@ class TestParseOrderUpdate:
         assert result.close_position is True
         assert result.reduce_only is True
 
+    def test_parse_order_update_distinguishes_adjacent_flags(self, client):
+        """cp / R / m 取值互不相同时各自落到对应字段（防止位置传参错位）"""
+        data = {
+            "e": "ORDER_TRADE_UPDATE",
+            "E": 1591097736594,
+            "o": {
+                "s": "BTCUSDT",
+                "c": "client_flags",
+                "S": "SELL",
+                "X": "NEW",
+                "i": 44444444,
+                "z": "0",
+                "ap": "0",
+                "ps": "LONG",
+                "cp": True,
+                "R": False,
+            }
+        }
+
+        result = client._parse_order_update(data)
+
+        assert result is not None
+        assert result.close_position is True
+        assert result.reduce_only is False
+        assert result.is_maker is None
+
+    def test_parse_order_update_reuses_cached_decimals(self, client):
+        """相同数值字符串复用同一个 Decimal 实例（值语义不变）"""
+        data = {
+            "e": "ORDER_TRADE_UPDATE",
+            "E": 1591097736594,
+            "o": {"s": "BTCUSDT", "S": "BUY", "X": "PARTIALLY_FILLED", "i": 1, "z": "0.5", "ap": "3000.5", "ps": "LONG"},
+        }
+
+        first = client._parse_order_update(data)
+        second = client._parse_order_update(data)
+
+        assert first is not None and second is not None
+        assert first.filled_qty == Decimal("0.5")
+        assert first.avg_price == Decimal("3000.5")
+        assert first.filled_qty is second.filled_qty
+        assert first.avg_price is second.avg_price
+
+    def test_parse_order_update_missing_numeric_fields_default_zero(self, client):
+        """缺省 z/ap 与 "0" 取值共用同一个零值 Decimal"""
+        data = {
+            "e": "ORDER_TRADE_UPDATE",
+            "E": 1591097736594,
+            "o": {"s": "BTCUSDT", "S": "BUY", "X": "NEW", "i": 1, "z": "0", "ps": "LONG"},
+        }
+
+        result = client._parse_order_update(data)
+
+        assert result is not None
+        assert result.avg_price == Decimal("0")
+        assert result.avg_price is result.filled_qty
+
 
 class TestParseAlgoOrderUpdate:
     """ALGO_UPDATE 解析测试"""
 
     def test_parse_algo_update_basic(self):
         updates: List[AlgoOrderUpdate] = []
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=lambda _: None,
-            on_algo_order_update=updates.append,
-        )
+        client, _ = _mkclient(on_algo_order_update=updates.append)
 
         data = {
             "e": "ALGO_UPDATE",
@@ -419,15 +436,9 @@ class TestParseAlgoOrderUpdate:
         assert result.close_position is True
         assert result.reduce_only is True
 
-    @pytest.mark.asyncio
     async def test_handle_algo_update_calls_callback(self):
         updates: List[AlgoOrderUpdate] = []
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=lambda _: None,
-            on_algo_order_update=updates.append,
-        )
+        client, _ = _mkclient(on_algo_order_update=updates.append)
 
         message = {
             "e": "ALGO_UPDATE",
@@ -448,15 +459,8 @@ class TestParseAlgoOrderUpdate:
         assert len(updates) == 1
         assert updates[0].symbol == "BTC/USDT:USDT"
 
-    def test_parse_order_update_empty_data(self):
+    def test_parse_order_update_empty_data(self, client):
         """测试解析空订单数据"""
-        updates: List[OrderUpdate] = []
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=updates.append,
-        )
-
         data = {
             "e": "ORDER_TRADE_UPDATE",
             "o": {}
@@ -465,18 +469,22 @@ class TestParseAlgoOrderUpdate:
         result = client._parse_order_update(data)
         assert result is None
 
-    def test_parse_order_update_no_order_field(self):
+    def test_parse_order_update_no_order_field(self, client):
         """测试解析缺少订单字段"""
-        updates: List[OrderUpdate] = []
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=updates.append,
-        )
+        data = {
+            "e": "ORDER_TRADE_UPDATE",
+            "E": 1591097736594,
+        }
 
+        result = client._parse_order_update(data)
+        assert result is None
+
+    def test_parse_order_update_missing_order_id(self, client):
+        """测试缺少 orderId（i）的订单数据被丢弃"""
         data = {
             "e": "ORDER_TRADE_UPDATE",
             "E": 1591097736594,
+            "o": {"s": "BTCUSDT", "S": "BUY", "X": "NEW", "z": "0", "ap": "0", "ps": "LONG"},
         }
 
         result = client._parse_order_update(data)
@@ -488,12 +496,7 @@ class TestParseAccountUpdate:
 
     def test_parse_account_update_positions(self):
         position_updates: List[PositionUpdate] = []
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=lambda _: None,
-            on_position_update=position_updates.append,
-        )
+        client, _ = _mkclient(on_position_update=position_updates.append)
 
         data = {
             "e": "ACCOUNT_UPDATE",
@@ -529,14 +532,30 @@ class TestParseAccountUpdate:
         assert parsed[2].entry_price is None
         assert parsed[2].unrealized_pnl == Decimal("0")
 
+    def test_parse_account_update_skips_non_hedge_side(self, client):
+        """单向持仓（ps=BOTH）与非 dict 条目被跳过"""
+        data = {
+            "e": "ACCOUNT_UPDATE",
+            "E": 1591097736594,
+            "a": {
+                "P": [
+                    {"s": "BTCUSDT", "pa": "0.1", "ep": "50000", "up": "0", "ps": "BOTH"},
+                    "garbage",
+                    {"s": "ETHUSDT", "pa": "-0.2", "ep": "3000", "up": "0", "ps": "short"},
+                ]
+            },
+        }
+
+        parsed = client._parse_account_update(data)
+
+        assert len(parsed) == 1
+        assert parsed[0].symbol == "ETH/USDT:USDT"
+        assert parsed[0].position_side == PositionSide.SHORT
+        assert parsed[0].position_amt == Decimal("-0.2")
+
     def test_parse_account_update_event(self):
         account_events: List[AccountUpdateEvent] = []
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=lambda _: None,
-            on_account_update_event=account_events.append,
-        )
+        client, _ = _mkclient(on_account_update_event=account_events.append)
 
         data = {
             "e": "ACCOUNT_UPDATE",
@@ -564,12 +583,7 @@ class TestParseAccountConfigUpdate:
 
     def test_parse_account_config_update_leverage(self):
         leverage_updates: List[LeverageUpdate] = []
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=lambda _: None,
-            on_leverage_update=leverage_updates.append,
-        )
+        client, _ = _mkclient(on_leverage_update=leverage_updates.append)
 
         data = {
             "e": "ACCOUNT_CONFIG_UPDATE",
@@ -586,15 +600,8 @@ class TestParseAccountConfigUpdate:
 class TestParseOrderStatus:
     """订单状态解析测试"""
 
-    def test_parse_all_statuses(self):
+    def test_parse_all_statuses(self, client):
         """测试所有状态解析"""
-        updates: List[OrderUpdate] = []
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=updates.append,
-        )
-
         assert client._parse_order_status("NEW") == OrderStatus.NEW
         assert client._parse_order_status("PARTIALLY_FILLED") == OrderStatus.PARTIALLY_FILLED
         assert client._parse_order_status("FILLED") == OrderStatus.FILLED
@@ -602,30 +609,16 @@ class TestParseOrderStatus:
         assert client._parse_order_status("REJECTED") == OrderStatus.REJECTED
         assert client._parse_order_status("EXPIRED") == OrderStatus.EXPIRED
 
-    def test_parse_unknown_status(self):
+    def test_parse_unknown_status(self, client):
         """测试未知状态默认值"""
-        updates: List[OrderUpdate] = []
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=updates.append,
-        )
-
         assert client._parse_order_status("UNKNOWN") == OrderStatus.NEW
 
 
 class TestSymbolConversion:
     """Symbol 格式转换测试"""
 
-    def test_ws_to_symbol(self):
+    def test_ws_to_symbol(self, client):
         """测试 WS 格式转 ccxt 格式"""
-        updates: List[OrderUpdate] = []
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=updates.append,
-        )
-
         assert client._ws_to_symbol("BTCUSDT") == "BTC/USDT:USDT"
         assert client._ws_to_symbol("ETHUSDT") == "ETH/USDT:USDT"
 
@@ -633,15 +626,9 @@ class TestSymbolConversion:
 class TestHandleMessage:
     """消息处理测试"""
 
-    @pytest.mark.asyncio
     async def test_handle_order_trade_update(self):
         """测试处理订单更新消息"""
-        updates: List[OrderUpdate] = []
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=updates.append,
-        )
+        client, updates = _mkclient()
 
         message = {
             "e": "ORDER_TRADE_UPDATE",
@@ -664,17 +651,12 @@ class TestHandleMessage:
         assert updates[0].order_id == "12345678"
         assert updates[0].status == OrderStatus.FILLED
 
-    @pytest.mark.asyncio
     async def test_handle_account_update_calls_position_callback(self):
         """测试账户更新消息触发仓位更新回调"""
-        order_updates: List[OrderUpdate] = []
         position_updates: List[PositionUpdate] = []
         account_events: List[AccountUpdateEvent] = []
 
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=order_updates.append,
+        client, order_updates = _mkclient(
             on_position_update=position_updates.append,
             on_account_update_event=account_events.append,
         )
@@ -700,18 +682,11 @@ class TestHandleMessage:
         assert position_updates[0].position_side == PositionSide.LONG
         assert position_updates[0].position_amt == Decimal("0.1")
 
-    @pytest.mark.asyncio
     async def test_handle_account_config_update_calls_leverage_callback(self):
         """测试配置更新消息触发杠杆更新回调"""
-        order_updates: List[OrderUpdate] = []
         leverage_updates: List[LeverageUpdate] = []
 
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=order_updates.append,
-            on_leverage_update=leverage_updates.append,
-        )
+        client, order_updates = _mkclient(on_leverage_update=leverage_updates.append)
 
         message = {
             "e": "ACCOUNT_CONFIG_UPDATE",
@@ -726,15 +701,9 @@ class TestHandleMessage:
         assert leverage_updates[0].symbol == "BTC/USDT:USDT"
         assert leverage_updates[0].leverage == 25
 
-    @pytest.mark.asyncio
     async def test_handle_unknown_event_ignored(self):
         """测试未知事件被忽略"""
-        updates: List[OrderUpdate] = []
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=updates.append,
-        )
+        client, updates = _mkclient()
 
         message = {
             "e": "UNKNOWN_EVENT",
@@ -745,100 +714,88 @@ class TestHandleMessage:
 
         assert len(updates) == 0
 
+    async def test_handle_listen_key_expired_reconnects(self):
+        """测试 listenKey 过期事件触发重连"""
+        client, updates = _mkclient()
+        client._running = True
+        client._reconnect = AsyncMock()
 
-class TestReconnection:
-    """重连机制测试"""
+        await client._handle_message({"e": "listenKeyExpired", "E": 1576653824250})
 
-    def test_reconnect_count_initial(self):
-        """测试初始重连次数"""
-        updates: List[OrderUpdate] = []
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=updates.append,
-        )
+        client._reconnect.assert_awaited_once()
+        assert len(updates) == 0
 
-        assert client.reconnect_count == 0
 
-    def test_exponential_backoff_calculation(self):
-        """测试指数退避计算"""
-        updates: List[OrderUpdate] = []
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=updates.append,
-            initial_delay_ms=1000,
-            max_delay_ms=30000,
-            multiplier=2,
-        )
+class TestReceiveLoop:
+    """接收循环测试"""
 
-        # 初始延迟
-        assert client._current_delay_ms == 1000
+    async def test_receive_loop_decodes_text_frames(self):
+        """TEXT 帧经 orjson 解码后分派；非法 JSON 只记错误不中断循环"""
+        client, updates = _mkclient()
 
-        # 模拟计算下一次延迟
-        client._current_delay_ms = min(
-            client._current_delay_ms * client.multiplier,
-            client.max_delay_ms
+        bad_frame = aiohttp.WSMessage(aiohttp.WSMsgType.TEXT, "{not json", None)
+        good_frame = aiohttp.WSMessage(
+            aiohttp.WSMsgType.TEXT,
+            (
+                '{"e":"ORDER_TRADE_UPDATE","E":1591097736594,"o":{"s":"BTCUSDT","c":"client_123",'
+                '"S":"SELL","X":"FILLED","i":12345678,"z":"0.001","ap":"50000","ps":"LONG"}}'
+            ),
+            None,
         )
-        assert client._current_delay_ms == 2000
+        client._ws = MagicMock()
+        client._ws.__aiter__.return_value = [bad_frame, good_frame]
+        client._running = True
+        # 帧耗尽后循环按断线处理，重连替换为 mock
+        client._reconnect = AsyncMock()
 
-        # 继续倍增
-        client._current_delay_ms = min(
-            client._current_delay_ms * client.multiplier,
-            client.max_delay_ms
-        )
-        assert client._current_delay_ms == 4000
+        await client._receive_loop()
 
-    def test_exponential_backoff_max_cap(self):
-        """测试指数退避上限"""
-        updates: List[OrderUpdate] = []
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=updates.append,
-            initial_delay_ms=10000,
-            max_delay_ms=30000,
-            multiplier=2,
-        )
+        client._reconnect.assert_awaited_once()
 
-        # 第一次：10000 * 2 = 20000
-        client._current_delay_ms = min(
-            client._current_delay_ms * client.multiplier,
-            client.max_delay_ms
-        )
-        assert client._current_delay_ms == 20000
+        assert len(updates) == 1
+        assert updates[0].order_id == "12345678"
+        assert updates[0].filled_qty == Decimal("0.001")
 
-        # 第二次：20000 * 2 = 40000 -> cap to 30000
-        client._current_delay_ms = min(
-            client._current_delay_ms * client.multiplier,
-            client.max_delay_ms
-        )
-        assert client._current_delay_ms == 30000
+
+class TestReconnection:
+    """重连机制测试"""
+
+    def test_reconnect_count_initial(self, client):
+        """测试初始重连次数"""
+        assert client.reconnect_count == 0
+
+    @pytest.mark.parametrize(
+        "initial_delay_ms,multiplier,max_delay_ms,expected",
+        [
+            (1000, 2, 30000, [2000, 4000]),
+            (10000, 2, 30000, [20000, 30000]),  # 20000 * 2 = 40000 -> cap to 30000
+        ],
+        ids=["doubling", "max_cap"],
+    )
+    def test_exponential_backoff(self, initial_delay_ms, multiplier, max_delay_ms, expected):
+        """测试指数退避倍增与上限"""
+        client, _ = _mkclient(initial_delay_ms=initial_delay_ms, max_delay_ms=max_delay_ms, multiplier=multiplier)
+
+        # 初始延迟
+        assert client._current_delay_ms == initial_delay_ms
+
+        for delay_ms in expected:
+            client._current_delay_ms = min(
+                client._current_delay_ms * client.multiplier,
+                client.max_delay_ms
+            )
+            assert client._current_delay_ms == delay_ms
 
 
 class TestConnectionState:
     """连接状态测试"""
 
-    def test_is_connected_no_ws(self):
+    def test_is_connected_no_ws(self, client):
         """测试无 WS 连接时"""
-        updates: List[OrderUpdate] = []
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=updates.append,
-        )
-
         assert client.is_connected is False
 
-    def test_listen_key_property(self):
+    def test_listen_key_property(self, client):
         """测试 listenKey 属性"""
-        updates: List[OrderUpdate] = []
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=updates.append,
-        )
-
         assert client.listen_key is None
 
         client._listen_key = "test_listen_key_123"
@@ -848,14 +805,8 @@ class TestConnectionState:
 class TestDisconnectCleanup:
     """断开连接资源释放测试"""
 
-    @pytest.mark.asyncio
     async def test_disconnect_closes_session_even_if_close_listen_key_hangs(self):
-        updates: List[OrderUpdate] = []
-        client = UserDataWSClient(
-            api_key="key",
-            api_secret="secret",
-            on_order_update=updates.append,
-        )
+        client, _ = _mkclient()
 
         client._running = True
         client._listen_key = "test_listen_key"
@@ -877,6 +828,37 @@ class TestDisconnectCleanup:
         assert session_ref.closed is True
         assert client._session is None
 
+    async def test_disconnect_closes_session_when_close_listen_key_cancelled(self):
+        """关闭 listenKey 时被取消：取消照常上抛，自有 session 仍被释放"""
+        client, _ = _mkclient()
+
+        client._running = True
+        client._listen_key = "test_listen_key"
+        client._session = aiohttp.ClientSession()
+        session_ref = client._session
+        client._close_listen_key = AsyncMock(side_effect=asyncio.CancelledError)
+
+        with pytest.raises(asyncio.CancelledError):
+            await client.disconnect()
+
+        assert session_ref.closed is True
+        assert client._session is None
+
+    async def test_disconnect_keeps_external_session_open(self):
+        """外部传入的 session 由调用方管理：disconnect 不关闭"""
+        session = aiohttp.ClientSession()
+        client, _ = _mkclient(session=session)
+        client._running = True
+        client._ws = MagicMock()
+        client._ws.close = AsyncMock()
+
+        try:
+            await client.disconnect()
+            assert session.closed is False
+            assert client._session is session
+        finally:
+            await session.close()
+
 
 class TestConstants:
     """常量测试"""